@@ -1,15 +1,31 @@
 """Easy TOML."""
 from __future__ import print_function
 
+from functools import partial
+
 from eztoml.encoder import Encoder
+from .cache import ParseCache, SnapshotCache, default_cache
+from .cst import ConcreteDocument, parse_document
 from .decoder import Decoder
+from .diff import diff
+from .document import Document
+from .merge import merge
+from .parallel import decode_parallel, load_many
+from .patch import patch_file, patch_text
 from .errors import EzTomlDecodeError, EzTomlEncodeError, EzTomlError
+from .files import read_text
 from .tz import EzTomlTz
+from .watch import Watcher, watch
 
 __version__ = "0.0.1.dev3"
 
 
-def loads(src, **kwargs):
+def loads(src, cache=None, **kwargs):
+    # styles are recorded while decoding, so they can't be taken from a cache
+    if cache and kwargs.get("styles") is None:
+        # cache=True uses the shared, module-level cache
+        return (default_cache if cache is True else cache).loads(src, **kwargs)
+
     return Decoder(**kwargs).decode(src)
 
 
@@ -17,15 +33,88 @@ def load(f, **kwargs):
     return loads(f.read(), **kwargs)
 
 
+def load_path(path, mmap=True, cache_dir=None, workers=None, schema=None, **kwargs):
+    """Decode a TOML file by path, memory mapping it instead of buffering through a file object.
+
+    With ``cache_dir``, decoded documents are snapshotted to disk and reused while the file is unchanged.
+    With ``workers``, sections of the file are decoded in parallel by a pool of processes.
+    """
+    if cache_dir is not None and kwargs.get("styles") is None:
+        # snapshots hold plain tables, so the schema is applied to the document taken from the cache
+        if workers is not None:
+            decode = partial(decode_parallel, workers=workers, **kwargs)
+        else:
+            decode = partial(loads, **kwargs)
+
+        document = SnapshotCache(cache_dir).load_path(path, use_mmap=mmap, decode=decode, **kwargs)
+
+        if schema is not None:
+            from .schema import compile_schema
+
+            return compile_schema(schema)(document, ())
+
+        return document
+    elif workers is not None:
+        return decode_parallel(read_text(path, use_mmap=mmap), workers=workers, schema=schema, **kwargs)
+
+    return loads(read_text(path, use_mmap=mmap), schema=schema, **kwargs)
+
+
+def load_layers(paths, array_key=None, **kwargs):
+    """Decode a base file and overlay files by path, then :func:`merge` them in order."""
+    return merge(*[load_path(path, **kwargs) for path in paths], array_key=array_key)
+
+
+def load_stream(fileobj, separator="---", **kwargs):
+    """Decode a stream of TOML documents separated by a delimiter line.
+
+    Lines are read from ``fileobj`` one at a time, so only a single document is held in memory.
+    A single :class:`Decoder` is reused for every document in the stream.
+    """
+    decoder = Decoder(**kwargs)
+    separators = separator, separator.encode("utf-8")
+    lines = []
+
+    for line in fileobj:
+        if line.rstrip() in separators:
+            yield decoder.decode(line[:0].join(lines))
+            lines = []
+        else:
+            lines.append(line)
+
+    # a trailing separator shouldn't produce an extra empty document
+    if any(line.strip() for line in lines):
+        yield decoder.decode(lines[0][:0].join(lines))
+
+
 def dumps(document, **kwargs):
-    if not isinstance(document, dict):
-        raise EzTomlEncodeError("Unable to encode non-dictionary type: {}".format(type(src)))
+    if isinstance(document, ConcreteDocument):
+        # only the changed values of a syntax tree are encoded again
+        return document.dumps()
 
     return Encoder(**kwargs).encode(document)
 
 
-def dump(document, fileobj, **kwargs):
-    fileobj.write(dumps(document, **kwargs))
+def dump(document, fileobj, buffer_size=65536, **kwargs):
+    """Encode a document to a file-like object, writing it in chunks of about ``buffer_size`` characters."""
+    if isinstance(document, ConcreteDocument):
+        fileobj.write(document.dumps())
+        return
+
+    buffered = []
+    size = 0
+
+    for chunk in Encoder(**kwargs).iterencode(document):
+        buffered.append(chunk)
+        size += len(chunk)
+
+        if size >= buffer_size:
+            fileobj.write("".join(buffered))
+            buffered = []
+            size = 0
+
+    if buffered:
+        fileobj.write("".join(buffered))
 
 
 def lint_files(args=None):
@@ -61,12 +150,13 @@ def lint_files(args=None):
         print(path)
 
         try:
-            with io.open(path, "rt", encoding="utf-8") as infile:
-                decoded = load(infile, preserve_style=parsed.preserve_style)
+            # styles are kept in a side table, so the decoded strings stay plain
+            styles = {} if parsed.preserve_style else None
+            decoded = load_path(path, styles=styles)
 
             # load to an intermediate variable, so that we don't wipe out the file
             # if there's an error after the handle is opened
-            encoded = dumps(decoded, sort_keys=parsed.sort_keys, preserve_style=parsed.preserve_style)
+            encoded = dumps(decoded, sort_keys=parsed.sort_keys, preserve_style=parsed.preserve_style, styles=styles)
 
             with io.open(path, "wt", encoding="utf-8") as outfile:
                 outfile.write(encoded)
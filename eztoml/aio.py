@@ -0,0 +1,95 @@
+"""Decoding and encoding TOML from asyncio, without blocking the event loop."""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from .decoder import Decoder
+from .encoder import Encoder
+from .errors import EzTomlEncodeError
+from .files import atomic_write, file_mode, read_text
+from .sections import split_sections
+from .source import buffer_types, decode_utf8
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# get_running_loop is new in python 3.7
+_get_running_loop = getattr(asyncio, "get_running_loop", asyncio.get_event_loop)
+# "process" shares one pool, which is started on first use and shut down when the interpreter exits
+_process_pool = None
+
+
+def _get_process_pool():
+    global _process_pool
+
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor()
+
+    return _process_pool
+
+
+async def _run_in_executor(executor, func, *args):
+    loop = _get_running_loop()
+
+    if executor == "process":
+        executor = _get_process_pool()
+    elif executor == "thread":
+        # "thread" runs in the loop's default executor
+        executor = None
+
+    return await loop.run_in_executor(executor, func, *args)
+
+
+async def loads(src, chunk_size=DEFAULT_CHUNK_SIZE, executor=None, **kwargs):
+    """Decode a document, yielding to the event loop after every ``chunk_size`` characters of sections are applied.
+
+    With ``executor`` set to ``"thread"``, ``"process"`` or a ``concurrent.futures.Executor``, the document
+    is instead decoded by the executor.
+    """
+    decoder = Decoder(**kwargs)
+
+    if executor is not None:
+        return await _run_in_executor(executor, decoder.decode, src)
+
+    if isinstance(src, buffer_types):
+        src = decode_utf8(src)
+
+    document = decoder._table_type()
+    decoded_size = 0
+
+    # each section is applied as soon as it's decoded, like Decoder.decode, so building the document also yields
+    try:
+        for start, end in split_sections(src):
+            kind, path, items = decoder._decode_section_text(src[start:end])
+            decoder._apply_section(document, kind, path, items)
+            decoded_size += end - start
+
+            if decoded_size >= chunk_size:
+                decoded_size = 0
+                await asyncio.sleep(0)
+
+        document = decoder._finalize(document)
+    finally:
+        decoder._table_arrays = []
+        decoder._table_array_parents = set()
+        decoder._columns = {}
+
+    return document
+
+
+async def load_path(path, mmap=True, chunk_size=DEFAULT_CHUNK_SIZE, executor=None, **kwargs):
+    """Read a file in the loop's default executor, then decode it with :func:`loads`."""
+    loop = _get_running_loop()
+    text = await loop.run_in_executor(None, partial(read_text, path, use_mmap=mmap))
+    return await loads(text, chunk_size=chunk_size, executor=executor, **kwargs)
+
+
+def _dump_path(document, path, kwargs):
+    atomic_write(path, Encoder(**kwargs).encode(document).encode("utf-8"), mode=file_mode(path))
+
+
+async def dump_path(document, path, executor="thread", **kwargs):
+    """Encode a document and atomically write it to a file, in an executor."""
+    if not Encoder._is_table(document):
+        raise EzTomlEncodeError("Unable to encode non-table type: {}".format(type(document).__name__))
+
+    await _run_in_executor(executor, _dump_path, document, path, kwargs)
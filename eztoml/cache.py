@@ -0,0 +1,291 @@
+"""Caching of decoded documents."""
+import copy
+import hashlib
+import marshal
+import os
+import threading
+from collections import OrderedDict, namedtuple
+from datetime import date, datetime, time
+
+from .decoder import Decoder
+from .files import atomic_write, open_buffer, read_text
+from .source import buffer_types, decode_utf8
+from .types import string_types, InlineString, RawInlineString, MultiLineString, RawMultiLineString, FrozenDict
+from .tz import EzTomlTz
+
+# options that can make a document mutable, even when it's decoded with frozen=True
+_MUTABLE_OPTIONS = ("table_factory", "array_factory", "schema")
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "size", "nbytes", "maxsize", "max_bytes"])
+
+
+class ParseCache(object):
+    """LRU cache of decoded documents, keyed by a hash of the source and the decoder options.
+
+    With ``copy=True`` every hit returns a deep copy of the cached document. Otherwise, documents are
+    decoded with ``frozen=True`` and shared by all callers as read-only views. Documents decoded with
+    ``frozen=True`` are always shared, unless factories or a schema may have made them mutable.
+    """
+
+    def __init__(self, maxsize=128, max_bytes=None, copy=True):
+        # type: (int|None, int|None, bool) -> None
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.copy = copy
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        object.__init__(self)
+
+    @staticmethod
+    def make_key(src, options):  # type: (str|bytes, dict) -> tuple
+        if isinstance(src, string_types) and not isinstance(src, buffer_types):
+            src = src.encode("utf-8")
+
+        # options like columnar=[...] are given as lists, which aren't hashable
+        options = tuple((k, tuple(v) if isinstance(v, list) else v) for k, v in sorted(options.items()))
+        return hashlib.sha1(src).digest(), len(src), options
+
+    def loads(self, src, **kwargs):
+        if not self.copy:
+            kwargs["frozen"] = True
+
+        key = self.make_key(src, kwargs)
+
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._entries[key] = entry
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if entry is None:
+            document = Decoder(**kwargs).decode(src)
+            self._store(key, document)
+        else:
+            document, _ = entry
+
+        if kwargs.get("frozen") and all(kwargs.get(name) is None for name in _MUTABLE_OPTIONS):
+            return document
+
+        return copy.deepcopy(document)
+
+    def _store(self, key, document):
+        size = key[1]
+
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                return
+
+            self._entries[key] = document, size
+            self.nbytes += size
+
+            while (self.maxsize is not None and len(self._entries) > self.maxsize) or (
+                self.max_bytes is not None and self.nbytes > self.max_bytes
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.nbytes -= evicted_size
+                self.evictions += 1
+
+    def info(self):  # type: () -> CacheInfo
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, len(self._entries), self.nbytes, self.maxsize, self.max_bytes
+        )
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+
+# snapshots are tagged with tuples, so frozen arrays are stored as lists
+_STYLES = (InlineString, RawInlineString, MultiLineString, RawMultiLineString)
+# options whose values a snapshot can't restore with the same types
+_HOOK_OPTIONS = ("table_factory", "array_factory", "parse_float", "parse_int", "parse_datetime")
+
+
+def _pack(value):
+    value_type = type(value)
+
+    if value_type is dict or value_type is FrozenDict:
+        return {k: _pack(v) for k, v in value.items()}
+    elif value_type is list or value_type is tuple:
+        return [_pack(v) for v in value]
+    elif value_type in _STYLES:
+        return "s", _STYLES.index(value_type), str(value)
+    elif value_type is datetime:
+        offset = value.utcoffset()
+        offset = None if offset is None else int(offset.total_seconds()) // 60
+        return (
+            "D", value.year, value.month, value.day, value.hour, value.minute, value.second, value.microsecond, offset
+        )
+    elif value_type is date:
+        return "d", value.year, value.month, value.day
+    elif value_type is time:
+        return "t", value.hour, value.minute, value.second, value.microsecond
+    elif value_type in (str, bool, int, float) or isinstance(value, string_types):
+        return value
+
+    raise TypeError("Unable to snapshot {}".format(value_type.__name__))
+
+
+def _make_tz(minutes):
+    if minutes == 0:
+        return EzTomlTz("Z")
+
+    sign = "-" if minutes < 0 else "+"
+    return EzTomlTz("{}{:02d}:{:02d}".format(sign, *divmod(abs(minutes), 60)))
+
+
+def _unpack(value, frozen=False):
+    value_type = type(value)
+
+    if value_type is dict:
+        table = {k: _unpack(v, frozen) for k, v in value.items()}
+        return FrozenDict(table) if frozen else table
+    elif value_type is list:
+        array = [_unpack(v, frozen) for v in value]
+        return tuple(array) if frozen else array
+    elif value_type is not tuple:
+        return value
+
+    tag = value[0]
+    if tag == "s":
+        return _STYLES[value[1]](value[2])
+    elif tag == "D":
+        tz_info = None if value[8] is None else _make_tz(value[8])
+        return datetime(*value[1:8], tzinfo=tz_info)
+    elif tag == "d":
+        return date(*value[1:])
+    elif tag == "t":
+        return time(*value[1:])
+
+    raise ValueError("Unknown snapshot tag {!r}".format(tag))
+
+
+def _stat_signature(path):
+    stat = os.stat(path)
+    return stat.st_size, getattr(stat, "st_mtime_ns", stat.st_mtime)
+
+
+class SnapshotCache(object):
+    """On-disk cache of decoded files, stored as compact marshal snapshots.
+
+    A snapshot is used without reading the source file when its size and modification time are
+    unchanged, and otherwise only when the content hash still matches. Stale or corrupted snapshots
+    are replaced by decoding the source again. Files decoded with factory or parse hooks aren't cached,
+    since a snapshot can't restore the types they create.
+    """
+
+    version = 1
+    suffix = ".snapshot"
+
+    def __init__(self, cache_dir):  # type: (str) -> None
+        self.cache_dir = cache_dir
+        object.__init__(self)
+
+    def snapshot_path(self, path, options):  # type: (str, dict) -> str
+        key = repr((os.path.abspath(path), sorted(options.items()))).encode("utf-8")
+        return os.path.join(self.cache_dir, hashlib.sha1(key).hexdigest() + self.suffix)
+
+    def _read(self, snapshot_path, payload=True):
+        """Read the header and optionally the payload of a snapshot, returning None if it's unusable."""
+        try:
+            # python 2's marshal.load only reads from builtin file objects, not io's
+            with open(snapshot_path, "rb") as f:
+                header = marshal.load(f)
+                if not isinstance(header, tuple) or len(header) != 5 or header[0] != self.version:
+                    return None, None
+
+                return header, marshal.load(f) if payload else None
+        except (IOError, OSError, EOFError, ValueError, TypeError):
+            return None, None
+
+    def load_path(self, path, use_mmap=True, decode=None, **kwargs):
+        if any(kwargs.get(name) is not None for name in _HOOK_OPTIONS):
+            return (decode or Decoder(**kwargs).decode)(read_text(path, use_mmap=use_mmap))
+
+        snapshot_path = self.snapshot_path(path, kwargs)
+        signature = _stat_signature(path)
+        header, _ = self._read(snapshot_path, payload=False)
+        document = packed = None
+
+        if header is not None and header[2:4] == signature:
+            _, packed = self._read(snapshot_path)
+            document = self._unpack(packed, kwargs.get("frozen", False))
+            if document is not None:
+                return document
+
+        with open_buffer(path, use_mmap=use_mmap) as buf:
+            digest = hashlib.sha1(buf).digest()
+
+            # if the file was touched but not modified, then the snapshot can still be used
+            if header is not None and header[4] == digest:
+                _, packed = self._read(snapshot_path)
+                document = self._unpack(packed, kwargs.get("frozen", False))
+
+            if document is None:
+                document = (decode or Decoder(**kwargs).decode)(decode_utf8(buf))
+                packed = self._pack(document)
+
+        if packed is not None:
+            header = self.version, os.path.abspath(path), signature[0], signature[1], digest
+            self._write(snapshot_path, header, packed)
+
+        return document
+
+    @staticmethod
+    def _unpack(packed, frozen):
+        if not isinstance(packed, dict):
+            return None
+
+        try:
+            return _unpack(packed, frozen)
+        except (ValueError, TypeError, IndexError):
+            return None
+
+    @staticmethod
+    def _pack(document):
+        try:
+            return _pack(document)
+        except TypeError:
+            return None
+
+    def _write(self, snapshot_path, header, packed):
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+        atomic_write(snapshot_path, marshal.dumps(header) + marshal.dumps(packed))
+
+    def prune(self):  # type: () -> int
+        """Remove snapshots that are corrupted or no longer match their source file."""
+        removed = 0
+
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(self.suffix):
+                continue
+
+            snapshot_path = os.path.join(self.cache_dir, name)
+            header, _ = self._read(snapshot_path, payload=False)
+
+            try:
+                stale = header is None or header[2:4] != _stat_signature(header[1])
+            except (IOError, OSError):
+                stale = True
+
+            if stale:
+                os.remove(snapshot_path)
+                removed += 1
+
+        return removed
+
+
+default_cache = ParseCache()
@@ -0,0 +1,313 @@
+"""Concrete syntax trees, which keep the original text of a document while it's edited."""
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+from .decoder import Decoder, ROOT
+from .encoder import Encoder
+from .errors import EzTomlDecodeError, EzTomlEncodeError
+from .source import Source, buffer_types, decode_utf8
+
+_missing = object()
+
+
+class Node(object):
+    """A key/value pair and the span of its line, where the key path includes the indices of arrays of tables."""
+
+    __slots__ = (
+        "key",
+        "start",
+        "key_start",
+        "value_start",
+        "value_end",
+        "end",
+    )
+
+    def __init__(self, key, start, key_start, value_start, value_end, end):
+        # type: (tuple, int, int, int, int, int) -> None
+        self.key = key
+        self.start = start
+        self.key_start = key_start
+        self.value_start = value_start
+        self.value_end = value_end
+        self.end = end
+
+    def __repr__(self):
+        return "{self.__class__.__name__}({self.key!r}, {self.value_start}, {self.value_end})".format(self=self)
+
+
+class SectionNode(object):
+    """A table header, or the root table, and the key/value pairs up to the next header."""
+
+    __slots__ = (
+        "kind",
+        "path",
+        "start",
+        "header_end",
+        "end",
+        "nodes",
+    )
+
+    def __init__(self, kind, path, start, header_end):
+        # type: (str, tuple, int, int) -> None
+        self.kind = kind
+        self.path = path
+        self.start = start
+        self.header_end = header_end
+        self.end = None
+        self.nodes = []
+
+    @property
+    def insert_at(self):  # type: () -> int
+        """The offset after the last key/value pair, where new keys are added."""
+        if self.nodes:
+            return self.nodes[-1].end
+        elif self.kind == ROOT:
+            return self.end
+
+        return self.header_end
+
+    def __repr__(self):
+        return "{self.__class__.__name__}({self.kind!r}, {self.path!r}, {self.nodes!r})".format(self=self)
+
+
+def _line_end(text, pos):
+    end = text.find("\n", pos)
+    return len(text) if end == -1 else end + 1
+
+
+def _has_prefix(path, prefix):
+    return path[: len(prefix)] == prefix
+
+
+class ConcreteTable(MutableMapping):
+    """A table of a :class:`ConcreteDocument`, which records the keys that are changed through it."""
+
+    def __init__(self, document, path):  # type: (ConcreteDocument, tuple) -> None
+        self._document = document
+        self._path = path
+
+    def _table(self):
+        return self._document._lookup(self._path)
+
+    def __getitem__(self, key):
+        value = self._table()[key]
+        path = self._path + (key,)
+
+        if isinstance(value, dict):
+            return ConcreteTable(self._document, path)
+        elif isinstance(value, list) and value and all(isinstance(v, dict) for v in value):
+            return [ConcreteTable(self._document, path + (i,)) for i in range(len(value))]
+
+        return value
+
+    def __setitem__(self, key, value):
+        if isinstance(value, ConcreteTable):
+            value = dict(value.items())
+
+        self._table()[key] = value
+        self._document._dirty[self._path + (key,)] = None
+
+    def __delitem__(self, key):
+        del self._table()[key]
+        self._document._dirty[self._path + (key,)] = None
+
+    def __iter__(self):
+        return iter(self._table())
+
+    def __len__(self):
+        return len(self._table())
+
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, self._table())
+
+
+class ConcreteDocument(ConcreteTable):
+    """The root table of a document, with the spans of its headers and key/value pairs in the original text.
+
+    Changes made through the mapping interface are only written when the document is dumped. Everything
+    else is copied from the original text, including comments and whitespace. Arrays are returned as they
+    were decoded, so assign a new array to change one.
+    """
+
+    def __init__(self, text, value, sections):  # type: (str, dict, list[SectionNode]) -> None
+        ConcreteTable.__init__(self, self, ())
+        self.text = text
+        self.value = value
+        self.sections = sections
+        self.encoder = Encoder()
+        # changed paths, in the order they were changed
+        self._dirty = OrderedDict()
+        self._node_index = dict((node.key, node) for section in sections for node in section.nodes)
+
+    def _lookup(self, path, default=None):
+        value = self.value
+
+        for k in path:
+            try:
+                value = value[k]
+            except (KeyError, IndexError, TypeError):
+                if default is None:
+                    raise KeyError(path)
+                return default
+
+        return value
+
+    def _find_node(self, path):
+        """Find the key/value pair that defines a path, or one of the tables along it."""
+        for end in range(len(path), 0, -1):
+            node = self._node_index.get(path[:end])
+            if node is not None:
+                return node
+
+    def dumps(self):  # type: () -> str
+        """Write the original text, with only the changed values encoded again."""
+        splices = []
+        appended = []
+        done = []
+
+        # a changed value also covers any changes made within it
+        for path in sorted(self._dirty, key=len):
+            if any(_has_prefix(path, d) for d in done):
+                continue
+
+            done.append(path)
+            value = self._lookup(path, _missing)
+            node = self._find_node(path)
+
+            if node is not None:
+                done.append(node.key)
+
+                if value is _missing and node.key == path:
+                    splices.append((node.start, node.end, ""))
+                else:
+                    encoded = self.encoder.encode_value(self._lookup(node.key))
+                    splices.append((node.value_start, node.value_end, encoded))
+                continue
+
+            # remove everything that defined the previous value, then add the new value as a new definition
+            for section in self.sections:
+                if section.kind != ROOT and _has_prefix(section.path, path):
+                    splices.append((section.start, section.end, ""))
+                else:
+                    splices.extend((n.start, n.end, "") for n in section.nodes if _has_prefix(n.key, path))
+
+            if value is _missing:
+                continue
+            elif self._is_tables(value) and not any(isinstance(k, int) for k in path):
+                appended.append(self._encode_tables(path, value))
+            else:
+                splices.append(self._insert_kv(path, value))
+
+        return self._splice(splices, appended)
+
+    @staticmethod
+    def _is_tables(value):
+        if isinstance(value, dict):
+            return True
+
+        return isinstance(value, list) and len(value) > 0 and all(isinstance(v, dict) for v in value)
+
+    def _encode_tables(self, path, value):
+        for k in reversed(path):
+            value = {k: value}
+
+        return self.encoder.encode(value)
+
+    def _insert_kv(self, path, value):
+        # add the key to the table that holds the most of its path
+        section = None
+        for s in self.sections:
+            if _has_prefix(path[:-1], s.path) and (section is None or len(s.path) >= len(section.path)):
+                section = s
+
+        pos = section.insert_at
+        key = self.encoder.encode_keys(path[len(section.path):])
+        indent = ""
+
+        if section.nodes:
+            last = section.nodes[-1]
+            indent = self.text[last.start: last.key_start]
+
+        line = "{}{} = {}\n".format(indent, key, self.encoder.encode_value(value))
+
+        if pos > 0 and self.text[pos - 1] != "\n":
+            line = "\n" + line
+
+        return pos, pos, line
+
+    def _splice(self, splices, appended):
+        pieces = []
+        pos = 0
+
+        # new keys are inserted before any removal at the same offset
+        for start, end, replacement in sorted(splices, key=lambda splice: splice[:2]):
+            if start < pos:
+                raise EzTomlEncodeError("Overlapping changes at offset {}".format(start))
+
+            pieces.append(self.text[pos:start])
+            pieces.append(replacement)
+            pos = end
+
+        pieces.append(self.text[pos:])
+
+        text = "".join(pieces)
+
+        # new tables are separated from the rest of the document by a blank line
+        for encoded in appended:
+            if text.strip():
+                text = text.rstrip("\n") + "\n\n"
+
+            text += encoded
+
+        return text
+
+    def __str__(self):
+        return self.dumps()
+
+
+def parse_document(src):  # type: (str|bytes) -> ConcreteDocument
+    """Decode a document into a :class:`ConcreteDocument`, keeping the spans of its headers and key/value pairs."""
+    if isinstance(src, buffer_types):
+        src = decode_utf8(src)
+
+    decoder = Decoder()
+    decoder._spans = []
+    source = Source(src)
+    value = {}
+    sections = [SectionNode(ROOT, (), 0, 0)]
+
+    source.eat_ws()
+
+    while not source.eof:
+        start = source.pos
+        kind, path, items = decoder._decode_section(source)
+        decoder._apply_section(value, kind, path, items)
+        location = decoder._resolve_path(value, path)
+
+        if kind == ROOT:
+            section = sections[0]
+        else:
+            section = SectionNode(kind, location, start, _line_end(src, start))
+            sections[-1].end = start
+            sections.append(section)
+
+        for key, key_start, value_start, value_end in decoder._spans:
+            line_start = src.rfind("\n", 0, key_start) + 1
+            node = Node(location + key, line_start, key_start, value_start, value_end, _line_end(src, value_end))
+            section.nodes.append(node)
+
+        decoder._spans = []
+        source.eat_ws()
+
+    if not source.eof:
+        raise EzTomlDecodeError("Extraneous input")
+
+    value = decoder._finalize(value)
+    sections[-1].end = len(src)
+    return ConcreteDocument(src, value, sections)
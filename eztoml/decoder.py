@@ -1,10 +1,12 @@
 from __future__ import unicode_literals
 
 import datetime
+import operator
 import re
+from array import array
 
 from .errors import EzTomlDecodeError
-from .source import Source
+from .source import Source, buffer_types, decode_utf8
 from .tokens import (
     DQ_MULTI,
     DQ_INLINE,
@@ -17,7 +19,16 @@ from .tokens import (
     CONTROL_CHARS,
     ESCAPES,
 )
-from .types import InlineString, RawInlineString, MultiLineString, RawMultiLineString, string_types
+from .types import (
+    InlineString,
+    RawInlineString,
+    MultiLineString,
+    RawMultiLineString,
+    FrozenDict,
+    Record,
+    record_class,
+    string_types,
+)
 from .tz import EzTomlTz
 
 try:
@@ -25,78 +36,376 @@ try:
 except NameError:
     from_codepoint = chr
 
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+# kinds of sections, named by the prefix of their header
+ROOT = ""
+TABLE = "["
+TABLE_ARRAY = "[["
+
+
+# by default, a key missing from a row of a columnar array is an error
+_missing = object()
+
+
+try:
+    array("q")
+    _INT_TYPECODE = "q"
+except ValueError:
+    # python 2 has no long long typecode, so int columns use the platform's long
+    _INT_TYPECODE = "l"
+
+
+def _to_numeric_array(column):
+    """Convert a column of only ints or only floats to an :class:`array.array`, or return None."""
+    if not column:
+        return None
+
+    column_type = type(column[0])
+    if column_type not in (int, float) or any(type(value) is not column_type for value in column):
+        return None
+
+    try:
+        return array(_INT_TYPECODE if column_type is int else "d", column)
+    except (OverflowError, ValueError):
+        return None
+
+
+class _Columns(object):
+    """A columnar array of tables under construction, with the number of rows added so far."""
+
+    __slots__ = ("table", "size")
+
+    def __init__(self, table):
+        self.table = table
+        self.size = 0
+
 
 class Decoder(object):
     __escapes = ESCAPES
-    _time_regex = re.compile(r"^(\d{2}):(\d{2}):(\d{2})(?:\.(\d{3,}))?")
-    _date_regex = re.compile(r"^(\d{4})-(\d{2})-(\d{2})")
-    _tz_regex = re.compile(r"^(Z|[-+]\d{2}:\d{2})")
+    _time_regex = re.compile(r"(\d{2}):(\d{2}):(\d{2})(?:\.(\d{3,}))?")
+    _date_regex = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+    _tz_regex = re.compile(r"(Z|[-+]\d{2}:\d{2})")
     _datetime_regex = re.compile(
-        _date_regex.pattern[1:] + r"(?:[T ]" + _time_regex.pattern[1:] + ")" + _tz_regex.pattern[1:] + "?"
+        _date_regex.pattern + r"(?:[T ]" + _time_regex.pattern + ")" + _tz_regex.pattern + "?"
     )
-    _hex_regex = re.compile(r"^0x[A-Za-z0-9](?:_?[A-Za-z0-9])*")
-    _octal_regex = re.compile(r"^0o[0-7](?:_?[0-7])*")
-    _int_regex = re.compile(r"^[-+]?[0-9](?:_?[0-9])*")
-    _binary_regex = re.compile(r"^0b[0-1](?:_?[0-1])*")
-    _float_regex = re.compile(r"^[-+]?[0-9](?:_?[0-9])*(?:\.[0-9](?:_?[0-9])*)?(?:[eE][+-]?[0-9](?:_?[0-9])*)?")
-    _key_regex = re.compile(r"^[-_A-Za-z0-9]+", RE_FLAGS)
-    _is_hex4 = staticmethod(re.compile(r"^[A-Za-z0-9]{4}").match)
-    _is_hex8 = staticmethod(re.compile(r"^[A-Za-z0-9]{8}").match)
+    _hex_regex = re.compile(r"0x[A-Za-z0-9](?:_?[A-Za-z0-9])*")
+    _octal_regex = re.compile(r"0o[0-7](?:_?[0-7])*")
+    _int_regex = re.compile(r"[-+]?[0-9](?:_?[0-9])*")
+    _binary_regex = re.compile(r"0b[0-1](?:_?[0-1])*")
+    _float_regex = re.compile(r"[-+]?[0-9](?:_?[0-9])*(?:\.[0-9](?:_?[0-9])*)?(?:[eE][+-]?[0-9](?:_?[0-9])*)?")
+    _key_regex = re.compile(r"[-_A-Za-z0-9]+", RE_FLAGS)
+    # a rectangular array of decimal numbers is found by its brackets, then reduced one level at a time
+    _numeric_span_regex = re.compile(r"[^-+0-9eE._, \t\r\n]|[\[\]]")
+    _numeric_row_regex = re.compile(
+        r"\[{ws}({num}(?:{ws},{ws}{num})*){ws},?{ws}\]".format(
+            ws=r"[ \t\r\n]*",
+            num=r"[-+]?(?:0|[1-9](?:_?[0-9])*)(?:\.[0-9](?:_?[0-9])*)?(?:[eE][+-]?[0-9](?:_?[0-9])*)?",
+        )
+    )
+    _numeric_group_regex = re.compile(r"\[[ \t\r\n]*@(?:[ \t\r\n]*,[ \t\r\n]*@)*[ \t\r\n]*,?[ \t\r\n]*\]")
+    _numeric_ws_regex = re.compile(r"[ \t\r\n_]+")
+    _numeric_float_regex = re.compile(r"[^,]*?[.eE][^,]*")
+    _is_hex4 = staticmethod(re.compile(r"[A-Za-z0-9]{4}").match)
+    _is_hex8 = staticmethod(re.compile(r"[A-Za-z0-9]{8}").match)
     _get_escape = staticmethod(__escapes.get)
     _is_control_char = staticmethod(CONTROL_CHARS.__contains__)
 
-    def __init__(self, preserve_style=False):
+    # writes bypass the overridden methods of FrozenDict while it's under construction
+    _set_item = staticmethod(dict.__setitem__)
+    # checked with isinstance directly, since tables are checked for every row of an array of tables
+    _table_types = dict
+
+    def __init__(
+        self,
+        preserve_style=False,
+        frozen=False,
+        parse_float=None,
+        parse_int=None,
+        parse_datetime=None,
+        table_factory=None,
+        array_factory=None,
+        columnar=(),
+        columnar_fill=_missing,
+        numeric_columns=False,
+        compact_records=False,
+        numeric_arrays=None,
+        styles=None,
+        schema=None,
+    ):
+        """
+        :param parse_float: called with the text of every float, including ``nan``, ``inf`` and ``-inf``
+        :param parse_int: called with the decimal text of every integer
+        :param parse_datetime: called with the text of every offset or local date-time
+        :param table_factory: called with no arguments to create each table, instead of ``dict``
+        :param array_factory: called with a list of the items of each array, once it's complete
+        :param columnar: key paths of arrays of tables to decode as a table of columns, instead of a list of tables
+        :param columnar_fill: value for keys missing from some rows of a columnar array, which are an error by default
+        :param numeric_columns: store columns of only ints or only floats as :class:`array.array`
+        :param compact_records: decode the rows of arrays of tables with the same keys as their first row as
+            read-only :class:`~eztoml.types.Record` objects, which share their keys
+        :param numeric_arrays: with ``"numpy"``, decode rectangular arrays of only ints or only floats as ndarrays.
+            Other arrays, and their rows, are decoded as lists. Can't be combined with the parse or array hooks.
+        :param styles: a dict to record the style class of every string in, by its key path, such as
+            ``{("servers", 0, "host"): RawInlineString}``. Array items are found by their index.
+        :param schema: a dataclass, ``TypedDict`` or ``typing`` type to check the document against and convert it to,
+            as its tables are finished. See :func:`eztoml.schema.compile_schema`.
+        """
         self.preserve_types = preserve_style
+        self.frozen = frozen
+        self.parse_float = parse_float
+        self.parse_int = parse_int
+        self.parse_datetime = parse_datetime
+        self._table_type = table_factory or (FrozenDict if frozen else dict)
+        self._array_type = array_factory or (tuple if frozen else None)
+        self._table_arrays = []
+        # ids of the tables holding arrays of tables, which stay tables when compacting records
+        self._table_array_parents = set()
+        self.columnar = frozenset(
+            tuple(path.split(".")) if isinstance(path, string_types) else tuple(path) for path in columnar
+        )
+        self.columnar_fill = columnar_fill
+        self.numeric_columns = numeric_columns
+        self.compact_records = compact_records
+        self._columns = {}
+
+        if numeric_arrays == "numpy":
+            if parse_float is not None or parse_int is not None or array_factory is not None:
+                raise ValueError("numeric_arrays can't be combined with parse_float, parse_int or array_factory")
+
+            import numpy
+
+            self._numpy = numpy
+        elif numeric_arrays is not None:
+            raise ValueError("Unsupported numeric_arrays {!r}".format(numeric_arrays))
+        else:
+            self._numpy = None
+
+        self.numeric_arrays = numeric_arrays
+        self.styles = styles
+        self._section_styles = []
+        self._style_key = ()
+        self._style_path = []
+        # (key, key offset, value start, value end) of every key/value pair, when recorded for a syntax tree
+        self._spans = None
+        self.schema = schema
+
+        if schema is not None:
+            # typing isn't available on every python version, so schemas are only imported when they're used
+            from .schema import compile_schema
+
+            self._schema_plan = compile_schema(schema)
+        else:
+            self._schema_plan = None
+
+        if table_factory is not None and type(table_factory()) not in (dict, FrozenDict):
+            # other tables are written through their own methods, and may not be dicts at all
+            self._set_item = operator.setitem
+            self._table_types = (dict, Mapping)
+
+        # earlier rows of an array of tables may already be compacted, but the last row is always a table
+        self._row_types = (self._table_types, Record) if compact_records else self._table_types
+
         object.__init__(self)
 
     def decode(self, source):
-        if isinstance(source, bytes):
-            source = source.decode("utf-8")
+        if isinstance(source, buffer_types):
+            source = decode_utf8(source)
 
         if isinstance(source, string_types):
             source = Source(source)
         elif not isinstance(source, Source):
-            raise EzTomlDecodeError("Expected a Source or String to decode")
+            raise EzTomlDecodeError("Expected a Source, string or bytes-like object to decode")
+
+        self._table_arrays = []
+        self._table_array_parents = set()
+        self._columns = {}
+        self._section_styles = []
+        self._style_path = []
+
+        try:
+            source.eat_ws()
+            document = self._decode_root(source)
+            source.eat_ws()
+
+            if not source.eof:
+                raise EzTomlDecodeError("Extraneous input")
+
+            document = self._finalize(document)
+        finally:
+            self._table_arrays = []
+            self._table_array_parents = set()
+            self._columns = {}
+
+        return document
+
+    def _decode_section_text(self, text):  # type: (str) -> (str, tuple, list)
+        """Decode the text of a single section, as found by :func:`eztoml.sections.split_sections`.
 
+        Styles aren't recorded for sections decoded separately from their document.
+        """
+        source = Source(text)
+        self._section_styles = []
         source.eat_ws()
-        document = self._decode_root(source)
+
+        if source.eof:
+            return ROOT, (), []
+
+        section = self._decode_section(source)
         source.eat_ws()
 
         if not source.eof:
             raise EzTomlDecodeError("Extraneous input")
 
+        return section
+
+    def _build(self, sections):
+        """Create a document from decoded sections, applied in order."""
+        document = self._table_type()
+        self._table_arrays = []
+        self._table_array_parents = set()
+        self._columns = {}
+
+        try:
+            for kind, path, items in sections:
+                self._apply_section(document, kind, path, items)
+
+            document = self._finalize(document)
+        finally:
+            self._table_arrays = []
+            self._table_array_parents = set()
+            self._columns = {}
+
+        return document
+
+    def _finalize(self, document):
+        """Finish the tables of a document once every section is applied, returning the finished document."""
+        if self.compact_records:
+            for parent_table, key in self._table_arrays:
+                self._compact_last_row(parent_table[key])
+
+        # arrays of tables grow until the end of the document, so they're frozen last
+        if self._array_type is not None:
+            for parent_table, key in self._table_arrays:
+                self._set_item(parent_table, key, self._array_type(parent_table[key]))
+
+        for columns in self._columns.values():
+            for name, column in list(columns.table.items()):
+                converted = _to_numeric_array(column) if self.numeric_columns else None
+
+                if converted is None and self._array_type is not None:
+                    converted = self._array_type(column)
+
+                if converted is not None:
+                    self._set_item(columns.table, name, converted)
+
+        if self._schema_plan is not None:
+            # the tables are only referenced by the decoder, so the plan converts them in place
+            return self._schema_plan(document, ())
+
         return document
 
+    def _get_table(self, parent_table, key):
+        # create a table if it doesn't exist, otherwise take the one that does
+        table = parent_table.get(key)
+        if table is None:
+            table = self._table_type()
+            self._set_item(parent_table, key, table)
+
+        return table
+
     def _decode_root(self, source):
-        document = {}
+        document = self._table_type()
         source.eat_ws()
 
         while not source.eof:
-            if source.has_prefix("[["):
-                self._decode_table_array(source, document)
-            elif source.has_prefix("["):
-                self._decode_table(source, document, allow_existing=True)
-            elif source.peek(1) in (SQ_INLINE, DQ_INLINE) or source.peek_match(self._key_regex):
-                self._decode_kv(source, document)
-            else:
-                raise EzTomlDecodeError("Unknown input")
+            kind, path, items = self._decode_section(source)
+            self._apply_section(document, kind, path, items)
+
+            if self.styles is not None:
+                self._record_styles(document, path)
 
             source.eat_ws()
 
         return document
 
+    def _record_styles(self, document, path):
+        """Add the styles of the strings in the section that was just applied, now that its key paths are known."""
+        resolved = {}
+
+        for key, value_path, style in self._section_styles:
+            table_path = path + key[:-1]
+            if table_path not in resolved:
+                resolved[table_path] = self._resolve_path(document, table_path)
+
+            self.styles[resolved[table_path] + key[-1:] + value_path] = style
+
+        self._section_styles = []
+
+    def _resolve_path(self, document, path):
+        """Add the indices of the arrays of tables along a path, which always continues from their last table."""
+        resolved = []
+        sub_table = document
+
+        for k in path:
+            sub_table = sub_table[k]
+            resolved.append(k)
+
+            if isinstance(sub_table, (list, tuple)):
+                resolved.append(len(sub_table) - 1)
+                sub_table = sub_table[-1]
+
+        return tuple(resolved)
+
+    def _decode_section(self, source):  # type: (Source) -> (str, tuple, list)
+        """Decode a table header and its key/value pairs, without adding them to a document."""
+        if source.has_prefix(TABLE_ARRAY):
+            kind, path = TABLE_ARRAY, self._decode_table_array_header(source)
+        elif source.has_prefix(TABLE):
+            kind, path = TABLE, self._decode_table_header(source)
+        elif source.peek(1) in (SQ_INLINE, DQ_INLINE) or source.peek_match(self._key_regex):
+            kind, path = ROOT, ()
+        else:
+            raise EzTomlDecodeError("Unknown input")
+
+        return kind, path, self._decode_kv(source)
+
+    def _apply_section(self, document, kind, path, items):
+        """Add a decoded section to the document, enforcing the rules for redefining tables and keys."""
+        if kind == TABLE_ARRAY and path in self.columnar:
+            return self._append_row(document, path, items)
+        elif kind == TABLE_ARRAY:
+            table = self._open_table_array(document, path)
+        elif kind == TABLE:
+            table = self._open_table(document, path, allow_existing=True)
+        else:
+            table = document
+
+        keys = set()
+        for key, value in items:
+            self._insert_kv(table, key, value, keys)
+
+        return table
+
     def _make_table_path(self, path, document, check_arrays=True):
         sub_table = document
         for k in path:
             if k not in sub_table:
-                sub_table = sub_table.setdefault(k, {})
+                sub_table = self._get_table(sub_table, k)
                 continue
 
             sub_table = sub_table[k]
 
-            if not isinstance(sub_table, dict):
+            if self._columns and id(sub_table) in self._columns:
+                raise EzTomlDecodeError("Can't add a table or key to columnar array {}".format(k))
+
+            if not isinstance(sub_table, self._table_types):
                 if check_arrays and isinstance(sub_table, list) and len(sub_table) > 0:
-                    if len(sub_table) > 0 and all(isinstance(t, dict) for t in sub_table):
+                    row_types = self._row_types
+                    if len(sub_table) > 0 and all(isinstance(t, row_types) for t in sub_table):
                         sub_table = sub_table[-1]
                         continue
 
@@ -104,95 +413,181 @@ class Decoder(object):
 
         return sub_table
 
-    def _decode_kv(self, source, table):
-        keys = set()
+    def _decode_kv(self, source):  # type: (Source) -> list[(tuple, object)]
+        items = []
 
         while not source.eof and not source.has_prefix("["):
+            key_start = source.pos
             key = self._decode_key(source)
 
             # if no key was found, then we're done
             if key == ():
                 raise EzTomlDecodeError("Expected a key")
 
-            # can't redefine a key within an already constructed dict/table
-            for subkey_len in range(1, len(key)):
-                subkey = key[:subkey_len]
-                if subkey in keys:
-                    raise EzTomlDecodeError(
-                        "Can't add key {key} when {subkey} is already defined".format(key=key, subkey=subkey)
-                    )
-
-            keys.add(key)
-
             source.eat_inline_ws()
             if source.take(1) != "=":
                 raise EzTomlDecodeError("Missing = after table key")
 
             source.eat_inline_ws()
-            sub_table = self._make_table_path(key[:-1], table)
-
-            if key[-1] in sub_table:
-                raise EzTomlDecodeError("Duplicate key {}".format(key))
-
+            self._style_key = key
+            value_start = source.pos
             value = self._decode_value(source)
 
+            if self._spans is not None:
+                self._spans.append((key, key_start, value_start, source.pos))
+
             source.eat_ws(must_advance=True)
-            sub_table[key[-1]] = value
-            keys.add(key)
+            items.append((key, value))
 
-        return table
+        return items
+
+    def _insert_kv(self, table, key, value, keys):
+        # can't redefine a key within an already constructed dict/table
+        for subkey_len in range(1, len(key)):
+            subkey = key[:subkey_len]
+            if subkey in keys:
+                raise EzTomlDecodeError(
+                    "Can't add key {key} when {subkey} is already defined".format(key=key, subkey=subkey)
+                )
+
+        keys.add(key)
+        sub_table = self._make_table_path(key[:-1], table)
+
+        if key[-1] in sub_table:
+            raise EzTomlDecodeError("Duplicate key {}".format(key))
 
-    def _decode_table(self, source, document, allow_existing=False):
+        self._set_item(sub_table, key[-1], value)
+
+    def _decode_table_header(self, source):  # type: (Source) -> tuple[str]
         if not source.has_prefix("[") or source.has_prefix("[["):
             raise EzTomlDecodeError("Expected table")
 
         source.take(1)
         source.eat_inline_ws()
         path = self._decode_key(source)
-        parent_table = self._make_table_path(path[:-1], document)
-
-        if path[-1] in parent_table:
-            existing = parent_table[path[-1]]
-            if not isinstance(existing, dict):
-                raise EzTomlDecodeError("Value already defined as {}".format(type(existing).__name__.lower()))
-
-            has_kv = any(not isinstance(v, dict) for v in existing.values())
-            if allow_existing is False or has_kv:
-                raise EzTomlDecodeError("Duplicated table")
-
-        # create a table if it doesn't exist, otherwise take the one that does
-        table = parent_table.setdefault(path[-1], {})
         source.eat_inline_ws()
 
+        if not path:
+            raise EzTomlDecodeError("Expected a table name")
+
         if source.take(1) != "]":
             raise EzTomlDecodeError("Unclosed table initializer. Expected: ]")
 
         source.eat_ws(must_advance=True)
-        return self._decode_kv(source, table)
+        return path
 
-    def _decode_table_array(self, source, document):
+    def _decode_table_array_header(self, source):  # type: (Source) -> tuple[str]
         if source.take(2) != "[[":
             raise EzTomlDecodeError("Expected table")
 
         source.eat_inline_ws()
         path = self._decode_key(source)
+        source.eat_inline_ws()
+
+        if not path:
+            raise EzTomlDecodeError("Expected a table name")
+
+        if source.take(2) != "]]":
+            raise EzTomlDecodeError("Unclosed table array initializer. Expected: ]]")
+
+        source.eat_ws(must_advance=True)
+        return path
+
+    def _open_table(self, document, path, allow_existing=False):
         parent_table = self._make_table_path(path[:-1], document)
-        table = {}
 
-        if isinstance(parent_table.get(path[-1]), list) and len(parent_table[path[-1]]) == 0:
+        if path[-1] in parent_table:
+            existing = parent_table[path[-1]]
+            if not isinstance(existing, self._table_types):
+                raise EzTomlDecodeError("Value already defined as {}".format(type(existing).__name__.lower()))
+
+            has_kv = any(not isinstance(v, self._table_types) for v in existing.values())
+            if allow_existing is False or has_kv:
+                raise EzTomlDecodeError("Duplicated table")
+
+        return self._get_table(parent_table, path[-1])
+
+    def _open_table_array(self, document, path):
+        parent_table = self._make_table_path(path[:-1], document)
+        table = self._table_type()
+        array = parent_table.get(path[-1])
+
+        if array is None:
+            array = []
+            self._set_item(parent_table, path[-1], array)
+            self._table_arrays.append((parent_table, path[-1]))
+            self._table_array_parents.add(id(parent_table))
+        elif not isinstance(array, list):
+            raise EzTomlDecodeError("Duplicated table")
+        elif len(array) == 0:
             raise EzTomlDecodeError("Can't add table to existing list")
+        elif self.compact_records:
+            # a row can't be changed once the next one is started
+            self._compact_last_row(array)
+
+        array.append(table)
+        return table
+
+    def _compact_last_row(self, array):
+        row = array[-1]
+        first = array[0]
+        keys = first._keys if isinstance(first, Record) else tuple(first)
 
-        if not isinstance(parent_table.setdefault(path[-1], []), list):
+        if len(row) != len(keys) or not all(key in row for key in keys):
+            return
+
+        values = [row[key] for key in keys]
+
+        # rows holding arrays of tables stay tables, since those arrays are still replaced when they're finalized
+        if id(row) in self._table_array_parents and any(type(value) is list for value in values):
+            return
+
+        array[-1] = record_class(keys)(values)
+
+    def _append_row(self, document, path, items):
+        """Add the items of a table to the columns of a columnar array of tables."""
+        parent_table = self._make_table_path(path[:-1], document)
+        table = parent_table.get(path[-1])
+
+        if table is None:
+            table = self._table_type()
+            self._set_item(parent_table, path[-1], table)
+            self._columns[id(table)] = _Columns(table)
+        elif id(table) not in self._columns:
             raise EzTomlDecodeError("Duplicated table")
 
-        parent_table[path[-1]].append(table)
-        source.eat_inline_ws()
+        columns = self._columns[id(table)]
+        size = columns.size
 
-        if source.take(2) != "]]":
-            raise EzTomlDecodeError("Unclosed table array initializer. Expected: ]]")
+        for key, value in items:
+            if len(key) != 1:
+                raise EzTomlDecodeError("Columnar array {} can't have dotted key {}".format(path, key))
 
-        source.eat_ws(must_advance=True)
-        return self._decode_kv(source, table)
+            column = table.get(key[0])
+            if column is None:
+                column = self._fill_column(path, key[0], [], size)
+                self._set_item(table, key[0], column)
+            elif len(column) > size:
+                raise EzTomlDecodeError("Duplicate key {}".format(key))
+
+            column.append(value)
+
+        columns.size = size + 1
+
+        for name, column in table.items():
+            if len(column) <= size:
+                self._fill_column(path, name, column, size + 1)
+
+        return table
+
+    def _fill_column(self, path, name, column, size):
+        if len(column) < size:
+            if self.columnar_fill is _missing:
+                raise EzTomlDecodeError("Missing key {} in row {} of columnar array {}".format(name, len(column), path))
+
+            column.extend([self.columnar_fill] * (size - len(column)))
+
+        return column
 
     def _decode_key(self, source):  # type: (Source) -> tuple[str]
         path = []
@@ -231,7 +626,7 @@ class Decoder(object):
             raise EzTomlDecodeError("Expected {")
 
         source.eat_ws()
-        table = {}
+        table = self._table_type()
 
         while not source.eof:
             if source.remove_prefix("}"):
@@ -252,7 +647,14 @@ class Decoder(object):
                 raise EzTomlDecodeError("Missing = for inline table key")
 
             source.eat_inline_ws()
-            parent_table[key[-1]] = self._decode_value(source)
+
+            if self.styles is None:
+                self._set_item(parent_table, key[-1], self._decode_value(source))
+            else:
+                self._style_path.extend(key)
+                self._set_item(parent_table, key[-1], self._decode_value(source))
+                del self._style_path[-len(key):]
+
             source.eat_inline_ws()
 
         raise EzTomlDecodeError("Expected } not EOF")
@@ -272,13 +674,85 @@ class Decoder(object):
                     break
 
             if source.remove_prefix("]"):
-                return array
+                return array if self._array_type is None else self._array_type(array)
+
+            if self.styles is None:
+                array.append(self._decode_value(source))
+            else:
+                self._style_path.append(len(array))
+                array.append(self._decode_value(source))
+                self._style_path.pop()
 
-            array.append(self._decode_value(source))
             source.eat_ws()
 
         raise EzTomlDecodeError("Expected ]")
 
+    def _decode_numeric_array(self, source):
+        """Decode a rectangular array of only ints or only floats into an ndarray, or return None if it isn't one."""
+        depth = 0
+
+        for matched in self._numeric_span_regex.finditer(source.text, source.pos):
+            char = matched.group()
+
+            if char == "[":
+                depth += 1
+            elif char == "]":
+                depth -= 1
+                if depth == 0:
+                    break
+            else:
+                return None
+        else:
+            return None
+
+        span = source.text[source.pos: matched.end()]
+
+        # replace the innermost arrays with a placeholder, then each enclosing array, checking their lengths match
+        rows = []
+        reduced = self._numeric_row_regex.sub(lambda row: rows.append(row.group(1)) or "@", span)
+        row_lengths = set(row.count(",") for row in rows)
+
+        if len(row_lengths) != 1:
+            return None
+
+        shape = [row_lengths.pop() + 1]
+        num_arrays = len(rows)
+
+        while reduced != "@":
+            lengths = []
+
+            def count_group(group):
+                lengths.append(group.group().count("@"))
+                return "@"
+
+            reduced = self._numeric_group_regex.sub(count_group, reduced)
+
+            if not lengths or sum(lengths) != num_arrays or len(set(lengths)) != 1:
+                return None
+
+            shape.insert(0, lengths[0])
+            num_arrays = len(lengths)
+
+        flat = self._numeric_ws_regex.sub("", ",".join(rows))
+        num_floats = len(self._numeric_float_regex.findall(flat))
+        size = flat.count(",") + 1
+
+        if num_floats not in (0, size):
+            return None
+
+        numpy = self._numpy
+
+        try:
+            result = numpy.array(flat.split(",")).astype(numpy.float64 if num_floats else numpy.int64).reshape(shape)
+        except (ValueError, OverflowError):
+            return None
+
+        if self.frozen:
+            result.flags.writeable = False
+
+        source.take(len(span))
+        return result
+
     def _decode_str(self, source):
         # type: (Source) -> str
         if source.has_prefix(DQ_MULTI):
@@ -296,6 +770,9 @@ class Decoder(object):
         else:
             raise EzTomlDecodeError("Unknown string type")
 
+        if self.styles is not None:
+            self._section_styles.append((self._style_key, tuple(self._style_path), cls))
+
         return cls(decoded) if self.preserve_types else decoded
 
     @classmethod
@@ -440,9 +917,17 @@ class Decoder(object):
 
         raise EzTomlDecodeError("Unexpected EOF while waiting for {}".format(SQ_INLINE))
 
-    @staticmethod
-    def _to_int(src, base):
-        return int(src.replace("_", ""), base)
+    def _to_int(self, src, base):
+        if self.parse_int is None:
+            return int(src.replace("_", ""), base)
+
+        return self.parse_int(src.replace("_", "") if base == 10 else str(int(src.replace("_", ""), base)))
+
+    def _to_float(self, src, default=None):
+        if self.parse_float is None:
+            return float(src) if default is None else default
+
+        return self.parse_float(src)
 
     def _decode_number(self, source):  # type: (Source) -> int|float
         try:
@@ -468,7 +953,7 @@ class Decoder(object):
                 if float_match == int_match:
                     return self._to_int(source.take(len(int_match)), 10)
                 else:
-                    return float(source.take(len(float_match)).replace("_", ""))
+                    return self._to_float(source.take(len(float_match)).replace("_", ""))
 
         except AssertionError as exc:
             raise EzTomlDecodeError("Did not find a valid number")
@@ -492,6 +977,10 @@ class Decoder(object):
                 raise EzTomlDecodeError("Invalid RFC-3399 time")
         elif check_datetime:
             source.take(len(check_datetime))
+
+            if self.parse_datetime is not None:
+                return self.parse_datetime(check_datetime)
+
             groups = list(self._datetime_regex.match(check_datetime).groups())
             tz_string = groups.pop()
             tz_info = EzTomlTz(tz_string) if tz_string else None
@@ -517,7 +1006,19 @@ class Decoder(object):
         elif source.has_prefix("{"):
             return self._decode_inline_table(source)
         elif source.has_prefix("["):
-            return self._decode_inline_array(source)
+            if self._numpy is None:
+                return self._decode_inline_array(source)
+
+            array = self._decode_numeric_array(source)
+            if array is not None:
+                return array
+
+            # the rows of an array that isn't rectangular stay lists, instead of becoming ndarrays of their own
+            numpy, self._numpy = self._numpy, None
+            try:
+                return self._decode_inline_array(source)
+            finally:
+                self._numpy = numpy
         elif source.peek(1) in "'\"":
             return self._decode_str(source)
         elif source.remove_prefix("true"):
@@ -525,11 +1026,11 @@ class Decoder(object):
         elif source.remove_prefix("false"):
             return False
         elif source.remove_prefix("+nan") or source.remove_prefix("-nan") or source.remove_prefix("nan"):
-            return NAN
+            return self._to_float("nan", NAN)
         elif source.remove_prefix("+inf") or source.remove_prefix("inf"):
-            return POS_INF
+            return self._to_float("inf", POS_INF)
         elif source.remove_prefix("-inf"):
-            return NEG_INF
+            return self._to_float("-inf", NEG_INF)
         elif source.peek(1) in "+-" or source.peek(1).isdigit():
             return self._decode_number(source)
         else:
@@ -0,0 +1,138 @@
+"""Structural comparison of decoded documents."""
+import math
+from collections import namedtuple
+from datetime import date, datetime, time
+
+from .encoder import _is_numpy_value
+from .types import number_types, string_types
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+Diff = namedtuple("Diff", ["added", "removed", "changed"])
+_array_types = list, tuple
+# the TOML type of a scalar, checked in order since bools are ints and datetimes are dates
+_scalar_types = bool, tuple(t for t in number_types if t is not float), float, string_types, datetime, date, time
+
+
+def _is_table(value):
+    return isinstance(value, (dict, Mapping))
+
+
+def _scalar_type(value):
+    for types in _scalar_types:
+        if isinstance(value, types):
+            return types
+
+    return type(value)
+
+
+def _same_scalar(old, new):
+    # 1, 1.0 and true are equal in python, but are different TOML values
+    if _scalar_type(old) is not _scalar_type(new):
+        return False
+    elif isinstance(old, float) and math.isnan(old):
+        return math.isnan(new)
+
+    return old == new
+
+
+def _plain(value):
+    # numpy arrays compare element-wise, so they're compared as the lists they'd be encoded as
+    return value.tolist() if _is_numpy_value(value) else value
+
+
+def _same_value(old, new):
+    if old is new:
+        return True
+
+    old, new = _plain(old), _plain(new)
+
+    if _is_table(old) and _is_table(new):
+        return len(old) == len(new) and all(k in old and _same_value(old[k], v) for k, v in new.items())
+    elif isinstance(old, _array_types) and isinstance(new, _array_types):
+        return len(old) == len(new) and all(_same_value(o, n) for o, n in zip(old, new))
+
+    return _same_scalar(old, new)
+
+
+def _index_tables(array, key):
+    # index an array of tables by the key field, as long as every table has a unique value
+    if key is None or not all(_is_table(t) and key in t for t in array):
+        return None
+
+    try:
+        indexed = dict((t[key], t) for t in array)
+    except TypeError:
+        # unhashable values can't be matched
+        return None
+
+    return indexed if len(indexed) == len(array) else None
+
+
+class _Differ(object):
+    def __init__(self, array_key):
+        self.array_key = array_key
+        self.added = []
+        self.removed = []
+        self.changed = []
+
+    def compare(self, old, new, path):
+        if old is new:
+            return
+
+        old, new = _plain(old), _plain(new)
+
+        if _is_table(old) and _is_table(new):
+            self.compare_tables(old, new, path)
+        elif isinstance(old, _array_types) and isinstance(new, _array_types):
+            self.compare_arrays(old, new, path)
+        elif not _same_value(old, new):
+            self.changed.append(path)
+
+    def compare_tables(self, old, new, path):
+        for k, v in new.items():
+            if k in old:
+                self.compare(old[k], v, path + (k,))
+            else:
+                self.added.append(path + (k,))
+
+        for k in old:
+            if k not in new:
+                self.removed.append(path + (k,))
+
+    def compare_arrays(self, old, new, path):
+        old_index = _index_tables(old, self.array_key)
+        new_index = _index_tables(new, self.array_key) if old_index is not None else None
+
+        if new_index is not None:
+            for k, v in new_index.items():
+                if k in old_index:
+                    self.compare(old_index[k], v, path + (k,))
+                else:
+                    self.added.append(path + (k,))
+
+            self.removed.extend(path + (k,) for k in old_index if k not in new_index)
+        elif all(_is_table(t) for t in old) and all(_is_table(t) for t in new):
+            for i, (old_table, new_table) in enumerate(zip(old, new)):
+                self.compare(old_table, new_table, path + (i,))
+
+            self.added.extend(path + (i,) for i in range(len(old), len(new)))
+            self.removed.extend(path + (i,) for i in range(len(new), len(old)))
+        elif not _same_value(old, new):
+            self.changed.append(path)
+
+
+def diff(old, new, array_key=None):  # type: (dict, dict, str) -> Diff
+    """Compare two documents, returning the key paths that were added, removed or changed.
+
+    Values are compared by their TOML type as well as with ``==``, so ``1``, ``1.0`` and ``true`` are all
+    different, and identical subtrees are skipped without visiting them. Arrays of tables are compared by index,
+    or by the value of ``array_key`` when every table in both arrays has a unique one, which is then used in the
+    path.
+    """
+    differ = _Differ(array_key)
+    differ.compare(old, new, ())
+    return Diff(differ.added, differ.removed, differ.changed)
@@ -0,0 +1,115 @@
+"""Incremental decoding of documents that are edited over time."""
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+
+from .decoder import Decoder, ROOT
+from .errors import EzTomlDecodeError
+from .sections import split_sections
+
+
+class Section(object):
+    __slots__ = (
+        "text",
+        "kind",
+        "path",
+        "items",
+        "groups",
+    )
+
+    def __init__(self, text, kind, path, items):
+        # type: (str, str, tuple[str], list) -> None
+        self.text = text
+        self.kind = kind
+        self.path = path
+        self.items = items
+
+        # the top-level keys that this section contributes to
+        if kind == ROOT:
+            self.groups = tuple(OrderedDict.fromkeys(key[0] for key, _ in items))
+        else:
+            self.groups = path[:1]
+
+    def __repr__(self):
+        return "{self.__class__.__name__}({self.kind!r}, {self.path!r}, {self.items!r})".format(self=self)
+
+
+class Document(object):
+    """A decoded document that can be updated incrementally as its text is edited.
+
+    The text is split into sections at each table header. An update only decodes the sections whose text
+    changed, and only rebuilds the top-level values that those sections contribute to. All other top-level
+    values are shared with the previous version, so the decoded value should be treated as read-only.
+    """
+
+    def __init__(self, text="", **kwargs):
+        self.decoder = Decoder(**kwargs)
+        self.text = ""
+        self.sections = []
+        self.value = self.decoder._table_type()
+        self.update(text)
+
+    def _decode_section(self, text):  # type: (str) -> Section
+        return Section(text, *self.decoder._decode_section_text(text))
+
+    def update(self, text):
+        """Decode a new version of the text, reusing the unchanged sections of the previous version."""
+        texts = [text[start:end] for start, end in split_sections(text)]
+        previous = self.sections
+
+        # only the sections between the unchanged prefix and suffix need to be decoded again
+        limit = min(len(texts), len(previous))
+        prefix = 0
+        while prefix < limit and texts[prefix] == previous[prefix].text:
+            prefix += 1
+
+        suffix = 0
+        while suffix < limit - prefix and texts[-1 - suffix] == previous[-1 - suffix].text:
+            suffix += 1
+
+        added = [self._decode_section(t) for t in texts[prefix:len(texts) - suffix]]
+        removed = previous[prefix:len(previous) - suffix]
+        sections = previous[:prefix] + added + previous[len(previous) - suffix:]
+        changed = set(group for section in removed + added for group in section.groups)
+
+        try:
+            value = self._build(sections, changed)
+        except EzTomlDecodeError:
+            # reused values may have been modified by an invalid definition, so start over from scratch
+            sections = [self._decode_section(t) for t in texts]
+            value = self._build(sections, set(group for section in sections for group in section.groups))
+
+        self.text = text
+        self.sections = sections
+        self.value = value
+        return value
+
+    def edit(self, start, end, replacement):  # type: (int, int, str) -> dict
+        """Replace the text between two offsets and update the document."""
+        return self.update(self.text[:start] + replacement + self.text[end:])
+
+    def _build(self, sections, changed):
+        decoder = self.decoder
+        rebuilt = decoder._build(self._changed_sections(sections, changed))
+
+        # splice the rebuilt and untouched values together, in the order they're defined
+        value = decoder._table_type()
+
+        for section in sections:
+            for group in section.groups:
+                if group in value:
+                    continue
+                elif group in changed:
+                    decoder._set_item(value, group, rebuilt[group])
+                else:
+                    decoder._set_item(value, group, self.value[group])
+
+        return value
+
+    @staticmethod
+    def _changed_sections(sections, changed):
+        for section in sections:
+            if section.kind == ROOT:
+                yield ROOT, (), [(key, value) for key, value in section.items if key[0] in changed]
+            elif section.path[0] in changed:
+                yield section.kind, section.path, section.items
@@ -1,10 +1,11 @@
 from __future__ import unicode_literals
 
 import re
+import sys
 import unicodedata
-from collections import OrderedDict
 from contextlib import contextmanager
 from datetime import date, time, datetime
+from functools import partial
 
 from eztoml.errors import EzTomlEncodeError
 from .tokens import (
@@ -20,46 +21,131 @@ from .types import unicode_type, string_types, number_types, InlineString, RawIn
     RawMultiLineString
 
 try:
-    from functools import lru_cache
+    from collections.abc import Mapping
 except ImportError:
-    # ignore if unavailable
-    def lru_cache(**_):
-        def decorator(f):
-            return f
+    from collections import Mapping
+
+try:
+    import dataclasses
+except ImportError:
+    dataclasses = None
+
+_scalar_types = (bytes, bool, date, time) + number_types
+_field_plans = {}
+
+
+# escapes for whole strings, with a fast path for the common case where there's nothing else to escape
+_escape_table = dict((ord(char), escaped) for char, escaped in UNESCAPES.items())
+_multi_line_escape_table = dict((k, v) for k, v in _escape_table.items() if k != ord(DQ_INLINE))
+_allowed_whitespace_table = dict.fromkeys(map(ord, " \b\f\n\r\t"))
+_must_escape_regex = re.compile("[{}]".format("".join(re.escape(c) for c in CONTROL_CHARS if c not in "\t\r\n")))
+
+try:
+    _isprintable = unicode_type.isprintable
+except AttributeError:
+    # python 2 doesn't have str.isprintable, so check each character's category
+    def _isprintable(seq):
+        return all(char == " " or unicodedata.category(char)[0] not in "CZ" for char in seq)
+
+
+def should_unicode_escape(seq):
+    """Determine if a string has any characters that need a unicode escape sequence.
+
+    These are the "Other" and "Separator" characters, except for spaces and the whitespace with short escapes,
+    which are exactly the characters that aren't printable.
+    """
+    return not _isprintable(seq) and not _isprintable(seq.translate(_allowed_whitespace_table))
 
-        return decorator
 
+def _unicode_escape(seq):
+    pieces = []
 
-@lru_cache(maxsize=1024)
-def should_unicode_escape(char):
-    """Determine if a character needs a unicode escape sequence."""
-    if char in " \b\f\n\r\t":
-        return False
+    for char in seq:
+        if _isprintable(char):
+            pieces.append(char)
+        elif ord(char) > 0xFFFF:
+            pieces.append("\\U{:08x}".format(ord(char)))
+        else:
+            pieces.append("\\u{:04x}".format(ord(char)))
+
+    return "".join(pieces)
 
-    category = unicodedata.category(char)
-    return category[0] in "CZ"
 
+def _escape(seq, table):
+    if _isprintable(seq):
+        # only quotes and backslashes may need to be escaped
+        if (DQ_INLINE in seq and ord(DQ_INLINE) in table) or "\\" in seq:
+            return seq.translate(table)
 
-@lru_cache(maxsize=1024)
-def escape_char(char):
-    if char in UNESCAPES:
-        return UNESCAPES[char]
-    elif should_unicode_escape(char):
-        codepoint = ord(char)
-        if codepoint > 0xFFFF:
-            return "\\U{:08x}".format(codepoint)
+        return seq
 
-        return "\\u{:04x}".format(codepoint)
-    else:
-        return char
+    # short escapes are printable, so only the remaining characters need unicode escapes
+    return _unicode_escape(seq.translate(table))
 
 
 def escape(seq):
-    return "".join(escape_char(c) for c in seq)
+    return _escape(seq, _escape_table)
 
 
 def escape_multi_line(seq):
-    return "".join(escape_char(c) if c != '"' else c for c in seq)
+    return _escape(seq, _multi_line_escape_table)
+
+
+def _is_numpy_value(value):
+    # numpy is optional, so it's only checked for when it's already imported
+    numpy = sys.modules.get("numpy")
+    return numpy is not None and isinstance(value, (numpy.ndarray, numpy.generic))
+
+
+def _mapping_items(obj):
+    return obj.items()
+
+
+def _attribute_items(names, obj):
+    for name in names:
+        try:
+            yield name, getattr(obj, name)
+        except AttributeError:
+            # unset slots are skipped, like None
+            continue
+
+
+def _public_slots(cls):
+    names = []
+
+    for base in reversed(cls.__mro__):
+        slots = base.__dict__.get("__slots__", ())
+        slots = (slots,) if isinstance(slots, string_types) else slots
+        names.extend(name for name in slots if not name.startswith("_") and name not in names)
+
+    return tuple(names)
+
+
+def _field_plan(cls):
+    """Find how to list the items of a table-like class, or None if it isn't one.
+
+    Mappings, dataclasses, namedtuples and objects with ``__slots__`` are supported. Plans are computed once per class.
+    """
+    try:
+        return _field_plans[cls]
+    except KeyError:
+        pass
+
+    plan = None
+
+    if issubclass(cls, (dict, Mapping)):
+        plan = _mapping_items
+    elif issubclass(cls, tuple) and hasattr(cls, "_fields"):
+        plan = partial(zip, cls._fields)
+    elif dataclasses is not None and dataclasses.is_dataclass(cls):
+        plan = partial(_attribute_items, tuple(f.name for f in dataclasses.fields(cls)))
+    elif not issubclass(cls, _scalar_types) and not issubclass(cls, string_types):
+        slots = _public_slots(cls)
+        if slots:
+            plan = partial(_attribute_items, slots)
+
+    _field_plans[cls] = plan
+    return plan
 
 
 class TokenStream(list):
@@ -127,14 +213,17 @@ class Table(object):
         "path",
         "kv",
         "depth",
+        "location",
     )
 
-    def __init__(self, path, kv, is_array, depth=0):
-        # type: (tuple[str], dict, bool, int) -> None
+    def __init__(self, path, kv, is_array, depth=0, location=None):
+        # type: (tuple[str], list[(str, object)], bool, int, tuple) -> None
         self.is_array = is_array
         self.path = path
         self.kv = kv
         self.depth = depth
+        # the path including the indices of arrays of tables
+        self.location = path if location is None else location
 
     def __repr__(self):
         return (
@@ -147,7 +236,9 @@ class Encoder(object):
     _key_regex = re.compile(r"^[-_A-Za-z0-9]+$")
     _word_regex = re.compile(r"[^\s]*\s*", re.MULTILINE | re.DOTALL | re.UNICODE)
 
-    def __init__(self, sort_keys=False, nl="\n", indent=2, wrap=120, preserve_cr=False, preserve_style=False):
+    def __init__(
+        self, sort_keys=False, nl="\n", indent=2, wrap=120, preserve_cr=False, preserve_style=False, styles=None
+    ):
         self.indent = indent
         self.nl = nl
         self.sort_keys = sort_keys
@@ -155,11 +246,25 @@ class Encoder(object):
         self.wrap = wrap
         self.preserve_cr = preserve_cr
         self.preserve_style = preserve_style
+        # styles of plain strings by key path, as recorded by Decoder(styles=...)
+        self.styles = styles
         object.__init__(self)
 
+    @staticmethod
+    def _is_table(value):
+        return type(value) is dict or _field_plan(type(value)) is not None
+
+    @staticmethod
+    def _items(value):
+        return value.items() if type(value) is dict else _field_plan(type(value))(value)
+
     def encode(self, document):
-        if not isinstance(document, dict):
-            raise EzTomlEncodeError("Unable to encode {}".format(document))
+        return "".join(self.iterencode(document))
+
+    def iterencode(self, document):
+        """Encode a document one piece at a time, so that it doesn't need to be held in memory at once."""
+        if not self._is_table(document):
+            raise EzTomlEncodeError("Unable to encode non-table type: {}".format(type(document).__name__))
 
         stream = TokenStream(indent=self.indent, nl=self.nl)
         tables = self._collect_tables(document)
@@ -168,42 +273,61 @@ class Encoder(object):
             if i > 0:
                 stream.flush()
 
-            self._write_table(table, stream)
+            # the stream is emptied after each line
+            for _ in self._write_table(table, stream):
+                yield stream.__unicode__()
+                del stream[:]
 
+    def encode_value(self, value):  # type: (object) -> str
+        """Encode a single value, as it would be written after ``key = ``."""
+        stream = TokenStream(indent=self.indent, nl=self.nl)
+        self._encode_value(value, stream)
         return stream.__unicode__()
 
-    def _collect_tables(self, current, prefix=(), is_array=False):
-        # type: (dict, tuple, bool) -> list[Table]
-        current_keys = OrderedDict([])
-        collected = []
-
-        for k, v in self.sorted(current.items()):
-            path = prefix + (k,)
-
-            if isinstance(v, dict):
-                collected.extend(self._collect_tables(v, prefix=path))
-            elif isinstance(v, (list, tuple)) and len(v) > 0 and all(isinstance(vv, dict) for vv in v):
-                for vv in v:
-                    collected.extend(self._collect_tables(vv, prefix=path, is_array=True))
-            elif v is not None:
-                # toml doesn't have null, so we just skip these
-                current_keys[unicode_type(k)] = v
-
-        # only create a parent table if it can't be collapsed/inferred by the c
-        if not (len(current) == 1 and isinstance(next(iter(current.values())), dict)):
-            # indent all child tables unless we're at the root
-            if prefix != ():
-                for table in collected:
-                    table.depth += 1
-
-                collected.insert(0, Table(prefix, current_keys, is_array))
-            elif len(current_keys) > 0:
-                collected.insert(0, Table(prefix, current_keys, is_array))
+    def encode_keys(self, keys):  # type: (tuple) -> str
+        """Encode a dotted key path."""
+        stream = TokenStream(indent=self.indent, nl=self.nl)
+        self._write_keys(keys, stream)
+        return stream.__unicode__()
 
-        return collected
+    def _collect_tables(self, document):
+        # type: (dict) -> Iterator[Table]
+        """Generate the tables of a document in the order they're written.
+
+        Each table's items are sorted once, and its depth is known when it's created.
+        """
+        # (table, path, is_array, location, depth) of the tables left to visit, with the next one last
+        pending = [(document, (), False, (), 0)]
+
+        while pending:
+            current, prefix, is_array, location, depth = pending.pop()
+            items = list(self.sorted(self._items(current)))
+            kv = []
+            children = []
+
+            for k, v in items:
+                if self._is_table(v):
+                    children.append((v, prefix + (k,), False, location + (k,)))
+                elif isinstance(v, (list, tuple)) and len(v) > 0 and all(self._is_table(vv) for vv in v):
+                    children.extend((vv, prefix + (k,), True, location + (k, i)) for i, vv in enumerate(v))
+                elif v is not None:
+                    # toml doesn't have null, so we just skip these
+                    kv.append((unicode_type(k), v))
+
+            # only create a parent table if it can't be collapsed/inferred by the children
+            child_depth = depth
+            if not (len(items) == 1 and self._is_table(items[0][1])):
+                # indent all child tables unless we're at the root
+                if prefix != ():
+                    yield Table(prefix, kv, is_array, depth=depth, location=location)
+                    child_depth = depth + 1
+                elif len(kv) > 0:
+                    yield Table(prefix, kv, is_array, depth=depth, location=location)
+
+            pending.extend((v, path, array, loc, child_depth) for v, path, array, loc in reversed(children))
 
     def _write_table(self, table, stream):
-        # type: (Table, TokenStream) -> None
+        # type: (Table, TokenStream) -> Iterator[None]
         # the top most fields don't need to be indented
         with stream.indented(table.depth):
             if table.path:
@@ -212,8 +336,11 @@ class Encoder(object):
                 else:
                     self._write_table_header(table, stream)
 
+                yield
+
             if table.kv:
-                self._write_kv(list(self.sorted(table.kv.items())), stream)
+                for _ in self._write_kv(table.kv, stream, table.location):
+                    yield
 
     def _write_array_table_header(self, table, stream):
         # type: (Table, TokenStream) -> None
@@ -241,14 +368,15 @@ class Encoder(object):
         stream.append("]")
         stream.flush()
 
-    def _write_kv(self, kv, stream):
-        # type: (list[str, object], TokenStream) -> None
+    def _write_kv(self, kv, stream, location=()):
+        # type: (list[str, object], TokenStream, tuple) -> Iterator[None]
         for k, v in kv:
             stream.tab()
             self._encode_key(k, stream)
             stream.append(" = ")
-            self._encode_value(v, stream)
+            self._encode_value(v, stream, path=location + (k,) if self.styles else None)
             stream.flush()
+            yield
 
     def _encode_key(self, key, stream):
         if isinstance(key, bool):
@@ -261,8 +389,8 @@ class Encoder(object):
         else:
             self._encode_string(key, stream, multiline=False)
 
-    def _encode_string(self, value, stream, multiline=True):
-        # type: (str, TokenStream, bool) -> None
+    def _encode_string(self, value, stream, multiline=True, path=None):
+        # type: (str, TokenStream, bool, tuple) -> None
         if isinstance(value, bytes):
             try:
                 value = value.decode("utf-8")
@@ -282,20 +410,24 @@ class Encoder(object):
 
         # strip out \r because we can't make any guarantees
         # and don't want to mix file endings in the target file
-        must_escape = any(k not in "\t\r\n" and k in CONTROL_CHARS for k in value)
-        should_escape = must_escape or any(should_unicode_escape(k) for k in value)
+        must_escape = _must_escape_regex.search(value) is not None
+        should_escape = must_escape or should_unicode_escape(value)
 
         style_types = InlineString, RawInlineString, MultiLineString, RawMultiLineString
+        style = type(value)
         method = None
 
-        if self.preserve_style and isinstance(value, style_types):
-            if isinstance(value, RawInlineString) and not (multiline or must_escape or has_tab or has_single_quote):
+        if self.styles and path is not None:
+            style = self.styles.get(path, style)
+
+        if self.preserve_style and issubclass(style, style_types):
+            if issubclass(style, RawInlineString) and not (multiline or must_escape or has_tab or has_single_quote):
                 method = self._encode_inline_raw_string
-            elif isinstance(value, InlineString) and not must_escape:
+            elif issubclass(style, InlineString) and not must_escape:
                 method = self._encode_inline_string
-            elif isinstance(value, RawMultiLineString) and not must_escape and SQ_MULTI not in value:
+            elif issubclass(style, RawMultiLineString) and not must_escape and SQ_MULTI not in value:
                 method = self._encode_multiline_raw_string
-            elif isinstance(value, MultiLineString):
+            elif issubclass(style, MultiLineString):
                 method = self._encode_multiline_string
 
         if method is not None:
@@ -373,7 +505,7 @@ class Encoder(object):
         stream.append(escape(value))
         stream.append(DQ_INLINE)
 
-    def _encode_inline_table(self, value, stream):  # type: (list, TokenStream) -> None
+    def _encode_inline_table(self, value, stream, path=None):  # type: (list, TokenStream, tuple) -> None
         # determine if it should be split across multiple lines
         multiline = False
         running_length = 0
@@ -407,7 +539,7 @@ class Encoder(object):
                     stream.flush()
                     stream.tab()
 
-                self._encode_value(v, stream)
+                self._encode_value(v, stream, path=None if path is None else path + (pos,))
 
         if multiline:
             # add a trailing comma
@@ -417,39 +549,41 @@ class Encoder(object):
 
         stream.append("]")
 
-    def _encode_value(self, value, stream, multiline=True):
+    def _encode_value(self, value, stream, multiline=True, path=None):
         if value is True:
             stream.append("true")
         elif value is False:
             stream.append("false")
         elif isinstance(value, float):
             # use repr() instead of str() because repr maintains precision better
-            # for Python 2.7
-            stream.append(repr(value))
+            # for Python 2.7, and float's own repr for subclasses like numpy.float64
+            stream.append(float.__repr__(value))
         elif isinstance(value, number_types):
             stream.append(str(value))
         elif isinstance(value, string_types):
-            self._encode_string(value, stream, multiline=multiline)
-        elif isinstance(value, dict):
+            self._encode_string(value, stream, multiline=multiline, path=path)
+        elif self._is_table(value):
             stream.append("{")
 
-            for pos, (k, v) in enumerate(self.sorted(value.items())):
+            for pos, (k, v) in enumerate(self.sorted(self._items(value))):
                 if pos != 0:
                     stream.append(", ")
 
                 self._encode_key(k, stream)
                 stream.append(" = ")
                 # don't allow multi-line strings within inline tables
-                self._encode_value(v, stream)
+                self._encode_value(v, stream, path=None if path is None else path + (k,))
 
             stream.append("}")
-        elif isinstance(value, list):
-            self._encode_inline_table(value, stream)
+        elif isinstance(value, (list, tuple)):
+            self._encode_inline_table(value, stream, path=path)
         elif isinstance(value, datetime):
             stream.append(value.isoformat())
         elif isinstance(value, time):
             stream.append(str(value))
         elif isinstance(value, date):
             stream.append(str(value))
+        elif _is_numpy_value(value):
+            self._encode_value(value.tolist(), stream, multiline=multiline, path=path)
         else:
             raise EzTomlEncodeError("Unable to encode {}".format(value))
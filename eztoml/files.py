@@ -0,0 +1,68 @@
+"""Reading and writing TOML files on disk."""
+import io
+import mmap
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+
+from .source import decode_utf8
+
+
+@contextmanager
+def open_buffer(path, use_mmap=True):
+    """Expose the contents of a file as a buffer, optionally through a read-only memory map."""
+    with io.open(path, "rb") as f:
+        if not use_mmap:
+            yield f.read()
+            return
+
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files can't be mapped
+            yield b""
+            return
+
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+
+def read_text(path, use_mmap=True):  # type: (str, bool) -> str
+    """Read and validate a UTF-8 encoded file."""
+    with open_buffer(path, use_mmap=use_mmap) as buf:
+        return decode_utf8(buf)
+
+
+def file_mode(path):  # type: (str) -> int
+    """The permissions of an existing file, or those a new file would be created with under the current umask."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        # the umask can only be read by setting it
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def atomic_write(path, data, mode=None):  # type: (str, bytes, int|None) -> None
+    """Write to a temporary file in the same directory, then move it over the destination.
+
+    The temporary file is only readable by its owner, unless a ``mode`` is given for it.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+
+    try:
+        with io.open(fd, "wb") as f:
+            f.write(data)
+
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+
+        replace = getattr(os, "replace", os.rename)
+        replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
@@ -0,0 +1,70 @@
+"""Layering of decoded documents."""
+from .diff import _array_types, _is_table, _index_tables
+
+
+def _rebuild(template, merged):
+    # keep the type of the base table, such as a FrozenDict
+    if type(template) is dict or not isinstance(template, dict):
+        return merged
+
+    return type(template)(merged)
+
+
+def _merge_tables(base, overlay, array_key):
+    if not overlay:
+        return base
+
+    merged = dict(base)
+
+    for k, v in overlay.items():
+        merged[k] = _merge_values(merged[k], v, array_key) if k in merged else v
+
+    return _rebuild(base, merged)
+
+
+def _merge_arrays(base, overlay, array_key):
+    base_index = _index_tables(base, array_key)
+    overlay_index = _index_tables(overlay, array_key) if base_index is not None else None
+
+    if overlay_index is None:
+        return overlay
+
+    merged = []
+
+    for table in base:
+        key = table[array_key]
+        merged.append(_merge_tables(table, overlay_index[key], array_key) if key in overlay_index else table)
+
+    merged.extend(table for table in overlay if table[array_key] not in base_index)
+    return type(base)(merged) if isinstance(base, tuple) else merged
+
+
+def _merge_values(base, overlay, array_key):
+    if base is overlay:
+        return base
+    elif _is_table(base) and _is_table(overlay):
+        return _merge_tables(base, overlay, array_key)
+    elif array_key is not None and isinstance(base, _array_types) and isinstance(overlay, _array_types):
+        return _merge_arrays(base, overlay, array_key)
+
+    return overlay
+
+
+def merge(base, *overlays, **kwargs):
+    """Deep merge overlays onto a base document, without modifying any of them.
+
+    Tables are merged recursively, and any other value in an overlay replaces the one in the base, including
+    arrays of tables. If ``array_key`` is set, and every table in both arrays has a unique value for it, then
+    tables with matching values are merged and the remaining tables in the overlay are appended.
+
+    Only the tables along overridden key paths are copied, and every untouched value is shared with the inputs.
+    """
+    array_key = kwargs.pop("array_key", None)
+    if kwargs:
+        raise TypeError("Unexpected keyword arguments: {}".format(", ".join(sorted(kwargs))))
+
+    merged = base
+    for overlay in overlays:
+        merged = _merge_tables(merged, overlay, array_key)
+
+    return merged
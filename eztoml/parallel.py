@@ -0,0 +1,108 @@
+"""Decoding TOML files in parallel."""
+from itertools import repeat
+from multiprocessing import cpu_count
+
+from .decoder import Decoder
+from .errors import EzTomlError
+from .sections import split_sections
+
+
+def _load_chunk(paths, options):
+    from . import load_path
+
+    results = []
+
+    for path in paths:
+        try:
+            results.append((path, load_path(path, **options)))
+        except (EzTomlError, IOError, OSError) as exc:
+            results.append((path, exc))
+
+    return results
+
+
+def _make_executor(executor, workers):
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    if executor == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    elif executor == "thread":
+        return ThreadPoolExecutor(max_workers=workers)
+
+    raise ValueError("Unknown executor {!r}. Expected 'process' or 'thread'".format(executor))
+
+
+def load_many(paths, workers=None, executor="process", ordered=False, chunksize=16, **kwargs):
+    """Decode files in a pool of workers, yielding ``(path, document)`` pairs.
+
+    Paths are dispatched to the workers in chunks. If a file can't be read or decoded, then the exception is
+    yielded in place of the document. Results are yielded as chunks complete, unless ``ordered`` is set.
+    An existing ``concurrent.futures.Executor`` can also be passed, and is left running.
+    """
+    from concurrent.futures import as_completed
+
+    paths = list(paths)
+    chunks = [paths[i:i + chunksize] for i in range(0, len(paths), chunksize)]
+    pool = _make_executor(executor, workers) if isinstance(executor, str) else executor
+
+    try:
+        futures = [pool.submit(_load_chunk, chunk, kwargs) for chunk in chunks]
+
+        for future in futures if ordered else as_completed(futures):
+            for result in future.result():
+                yield result
+    finally:
+        if pool is not executor:
+            pool.shutdown()
+
+
+def _decode_sections(texts, options):
+    decoder = Decoder(**options)
+    return [decoder._decode_section_text(text) for text in texts]
+
+
+def _chunk_sections(texts, num_chunks):
+    # group consecutive sections into chunks of roughly the same size
+    target = max(1, sum(len(text) for text in texts) // num_chunks)
+    chunks = [[]]
+    size = 0
+
+    for text in texts:
+        if size >= target:
+            chunks.append([])
+            size = 0
+
+        chunks[-1].append(text)
+        size += len(text)
+
+    return chunks
+
+
+def decode_parallel(text, workers=None, **kwargs):
+    """Decode a large document by splitting it at table headers and decoding the sections in worker processes.
+
+    The decoded sections are added to the document in their original order, with the same rules for
+    redefining tables and keys as :class:`Decoder`.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    if not workers:
+        try:
+            # os.cpu_count is new in python 3.4
+            workers = cpu_count()
+        except NotImplementedError:
+            workers = 1
+
+    decoder = Decoder(**kwargs)
+    texts = [text[start:end] for start, end in split_sections(text)]
+    chunks = _chunk_sections(texts, workers * 4)
+
+    if workers == 1 or len(chunks) == 1:
+        return decoder.decode(text)
+
+    # workers only decode sections, so a schema is left for the decoder that builds the document
+    options = dict((k, v) for k, v in kwargs.items() if k != "schema")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        decoded = pool.map(_decode_sections, chunks, repeat(options))
+        return decoder._build(section for sections in decoded for section in sections)
@@ -0,0 +1,110 @@
+"""Patching values in TOML text without decoding the whole document."""
+from __future__ import unicode_literals
+
+import os
+import stat
+from collections import OrderedDict
+
+from .decoder import Decoder
+from .encoder import Encoder
+from .errors import EzTomlDecodeError
+from .files import atomic_write, read_text
+from .sections import split_sections
+from .source import Source
+from .types import string_types
+
+
+def _parse_key(key):  # type: (str|tuple) -> tuple
+    if not isinstance(key, string_types):
+        return tuple(key)
+
+    # the key is followed by = so that it's decoded the same way as in a document
+    source = Source(key + " =")
+    path = Decoder()._decode_key(source)
+    source.eat_inline_ws()
+
+    if not path or source.remaining != "=":
+        raise EzTomlDecodeError("Invalid key {!r}".format(key))
+
+    return path
+
+
+def patch_text(text, changes, **kwargs):  # type: (str, dict, ...) -> str
+    """Replace the values of existing keys, given by dotted key paths, and keep the rest of the text as it is.
+
+    Only the table headers and the sections holding the keys are decoded. Keys within arrays of tables,
+    including their sub-tables, or inline tables can't be patched, and raise :class:`KeyError` like missing keys.
+    Other arguments are passed to the :class:`Encoder`.
+    """
+    decoder = Decoder()
+    encoder = Encoder(**kwargs)
+    targets = OrderedDict((_parse_key(key), (key, value)) for key, value in changes.items())
+    splices = []
+    found = set()
+    # headers that don't mention the last key of a table along any target path can be skipped without decoding
+    table_keys = set(target[i - 1] for target in targets for i in range(1, len(target)))
+
+    for start, _ in split_sections(text):
+        if len(found) == len(targets):
+            break
+
+        source = Source(text)
+        source.pos = start
+        source.eat_ws()
+
+        if source.has_prefix("["):
+            line_end = text.find("\n", source.pos)
+            header = text[source.pos: len(text) if line_end == -1 else line_end]
+            if not any(k in header for k in table_keys) and '"' not in header and "'" not in header:
+                continue
+
+            if source.has_prefix("[["):
+                # there's no single value to patch within an array of tables, or any of its sub-tables
+                path = decoder._decode_table_array_header(source)
+                for target, (key, _) in targets.items():
+                    if target[: len(path)] == path:
+                        raise KeyError(key)
+                continue
+
+            path = decoder._decode_table_header(source)
+            source.pos = start
+            source.eat_ws()
+        else:
+            path = ()
+
+        if source.eof or not any(len(t) > len(path) and t[: len(path)] == path for t in targets):
+            continue
+
+        decoder._spans = []
+        decoder._decode_section(source)
+
+        for key, _, value_start, value_end in decoder._spans:
+            target = targets.get(path + key)
+            if target is not None:
+                splices.append((value_start, value_end, encoder.encode_value(target[1])))
+                found.add(path + key)
+
+    for path, (key, _) in targets.items():
+        if path not in found:
+            raise KeyError(key)
+
+    pieces = []
+    pos = 0
+
+    for start, end, replacement in sorted(splices):
+        pieces.append(text[pos:start])
+        pieces.append(replacement)
+        pos = end
+
+    pieces.append(text[pos:])
+    return "".join(pieces)
+
+
+def patch_file(path, changes, mmap=True, **kwargs):  # type: (str, dict, bool, ...) -> None
+    """Replace the values of existing keys in a file, then atomically write it back, keeping its permissions."""
+    text = read_text(path, use_mmap=mmap)
+    patched = patch_text(text, changes, **kwargs)
+
+    if patched != text:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+        atomic_write(path, patched.encode("utf-8"), mode=mode)
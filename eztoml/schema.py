@@ -0,0 +1,248 @@
+"""Typed decoding of documents into dataclasses and TypedDicts."""
+import datetime
+import threading
+import typing
+
+try:
+    # the type of unions written as int | None, which is new in python 3.10
+    from types import UnionType
+except ImportError:
+    UnionType = None
+
+from .errors import EzTomlDecodeError
+from .types import string_types
+
+try:
+    import dataclasses
+except ImportError:
+    dataclasses = None
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+_plans = {}
+_pending = {}
+_lock = threading.RLock()
+_array_types = list, tuple
+
+
+def _format_path(path):
+    return ".".join(str(p) for p in path) or "<document>"
+
+
+def _type_name(schema):
+    return schema.__name__ if isinstance(schema, type) else str(schema).replace("typing.", "")
+
+
+def _fail(path, schema, value):
+    raise EzTomlDecodeError(
+        "Expected {} for {}, not {}".format(_type_name(schema), _format_path(path), type(value).__name__)
+    )
+
+
+def compile_schema(schema):
+    """Compile a type into a plan, which checks and converts a decoded value into that type.
+
+    Dataclasses, TypedDicts, ``typing`` containers, unions and the TOML scalar types are supported.
+    Plans are compiled once per type and reused. Plans convert the dicts and lists of a freshly decoded
+    document in place, instead of copying them, so they shouldn't be given values that are shared.
+    """
+    try:
+        return _plans[schema]
+    except KeyError:
+        pass
+
+    with _lock:
+        if schema in _plans:
+            return _plans[schema]
+        elif schema in _pending:
+            # a recursive type, which refers to the plan that's still being compiled
+            return _pending[schema]
+
+        try:
+            _plans[schema] = _compile(schema)
+        finally:
+            _pending.pop(schema, None)
+
+        return _plans[schema]
+
+
+def _compile(schema):
+    origin = getattr(schema, "__origin__", None)
+    args = getattr(schema, "__args__", None) or ()
+
+    if schema is typing.Any or schema is object:
+        return lambda value, path: value
+    elif dataclasses is not None and isinstance(schema, type) and dataclasses.is_dataclass(schema):
+        return _compile_dataclass(schema)
+    elif isinstance(schema, type) and issubclass(schema, dict) and hasattr(schema, "__total__"):
+        return _compile_typed_dict(schema)
+    elif origin is typing.Union or (UnionType is not None and isinstance(schema, UnionType)):
+        return _compile_union(schema, args)
+    elif origin in (list, typing.List, tuple, typing.Tuple):
+        return _compile_array(schema, origin, args)
+    elif origin in (dict, typing.Dict, Mapping, typing.Mapping):
+        return _compile_table(schema, args[1] if len(args) == 2 else typing.Any)
+    elif schema in (list, tuple):
+        return _compile_array(schema, schema, ())
+    elif schema is dict:
+        return _compile_table(schema, typing.Any)
+    elif schema is str:
+        return _check(schema, lambda value: isinstance(value, string_types))
+    elif schema is int:
+        return _check(schema, lambda value: isinstance(value, int) and not isinstance(value, bool))
+    elif schema is float:
+        return _compile_float()
+    elif schema is datetime.date:
+        # datetimes are also dates, but are decoded from a different TOML type
+        return _check(schema, lambda value: type(value) is datetime.date)
+    elif isinstance(schema, type):
+        return _check(schema, lambda value: isinstance(value, schema))
+
+    raise TypeError("Unsupported schema type {!r}".format(schema))
+
+
+def _check(schema, is_valid):
+    def plan(value, path):
+        if not is_valid(value):
+            _fail(path, schema, value)
+        return value
+
+    return plan
+
+
+def _compile_float():
+    def plan(value, path):
+        if isinstance(value, float):
+            return value
+        elif isinstance(value, int) and not isinstance(value, bool):
+            return float(value)
+        _fail(path, float, value)
+
+    return plan
+
+
+def _compile_union(schema, args):
+    plans = [compile_schema(arg) for arg in args if arg is not type(None)]
+    allows_none = type(None) in args
+
+    if len(plans) == 1:
+        # for Optional[...], report the error from the only option
+        def plan(value, path):
+            return value if value is None and allows_none else plans[0](value, path)
+
+        return plan
+
+    def plan(value, path):
+        if value is None and allows_none:
+            return value
+
+        for option in plans:
+            try:
+                return option(value, path)
+            except EzTomlDecodeError:
+                continue
+
+        _fail(path, schema, value)
+
+    return plan
+
+
+def _compile_array(schema, origin, args):
+    array_type = tuple if origin in (tuple, typing.Tuple) else list
+
+    if array_type is tuple and args and args[-1] is not Ellipsis:
+        # fixed length tuples, such as Tuple[int, str]
+        item_plans = [compile_schema(arg) for arg in args]
+
+        def plan(value, path):
+            if not isinstance(value, _array_types) or len(value) != len(item_plans):
+                _fail(path, schema, value)
+            return tuple(item_plan(item, path + (i,)) for i, (item_plan, item) in enumerate(zip(item_plans, value)))
+
+        return plan
+
+    item_plan = compile_schema(args[0] if args else typing.Any)
+
+    def plan(value, path):
+        if not isinstance(value, _array_types):
+            _fail(path, schema, value)
+        elif array_type is not list or type(value) is not list:
+            return array_type(item_plan(item, path + (i,)) for i, item in enumerate(value))
+
+        for i, item in enumerate(value):
+            converted = item_plan(item, path + (i,))
+            if converted is not item:
+                value[i] = converted
+
+        return value
+
+    return plan
+
+
+def _compile_table(schema, value_schema):
+    value_plan = compile_schema(value_schema)
+
+    def plan(value, path):
+        if not isinstance(value, (dict, Mapping)):
+            _fail(path, schema, value)
+        elif not isinstance(value, dict):
+            return {k: value_plan(v, path + (k,)) for k, v in value.items()}
+
+        for k, v in list(value.items()):
+            converted = value_plan(v, path + (k,))
+            if converted is not v:
+                # written with dict's method, since frozen tables are converted before they're returned
+                dict.__setitem__(value, k, converted)
+
+        return value
+
+    return plan
+
+
+def _compile_fields(cls, hints, required, make):
+    fields = {}
+
+    def plan(value, path):
+        if not isinstance(value, (dict, Mapping)):
+            _fail(path, cls, value)
+
+        # the decoder's tables are converted in place, and other mappings are copied
+        converted = value if isinstance(value, dict) else {}
+
+        for k, v in list(value.items()):
+            if k not in fields:
+                raise EzTomlDecodeError("Unexpected key {} for {}".format(_format_path(path + (k,)), cls.__name__))
+
+            item = fields[k](v, path + (k,))
+            if item is not v or converted is not value:
+                dict.__setitem__(converted, k, item)
+
+        for k in required:
+            if k not in converted:
+                raise EzTomlDecodeError("Missing key {} for {}".format(_format_path(path + (k,)), cls.__name__))
+
+        return make(converted)
+
+    # register the plan before compiling the fields, so that recursive types resolve to it
+    _pending[cls] = plan
+    fields.update((name, compile_schema(hint)) for name, hint in hints.items())
+    return plan
+
+
+def _compile_dataclass(cls):
+    hints = typing.get_type_hints(cls)
+    fields = [f for f in dataclasses.fields(cls) if f.init]
+    required = [
+        f.name for f in fields if f.default is dataclasses.MISSING and f.default_factory is dataclasses.MISSING
+    ]
+    return _compile_fields(cls, dict((f.name, hints[f.name]) for f in fields), required, lambda table: cls(**table))
+
+
+def _compile_typed_dict(cls):
+    hints = typing.get_type_hints(cls)
+    required = getattr(cls, "__required_keys__", hints if cls.__total__ else ())
+    # TypedDicts are dicts at runtime, so the table itself is the result
+    return _compile_fields(cls, hints, list(required), lambda table: table)
@@ -0,0 +1,54 @@
+"""Fast pre-scan of TOML text into sections that each begin at a table header."""
+from __future__ import unicode_literals
+
+import re
+
+from .tokens import RE_FLAGS
+
+_token_regex = re.compile(r"\"\"\"|'''|[\"'#\[\]{}\n]")
+_skip_regexes = {
+    '"""': re.compile(r'"""(?:\\.|[^\\])*?"""(?:""?)?', RE_FLAGS),
+    "'''": re.compile(r"'''.*?'''(?:''?)?", RE_FLAGS),
+    '"': re.compile(r'"(?:\\.|[^"\\\n])*"', RE_FLAGS),
+    "'": re.compile(r"'[^'\n]*'", RE_FLAGS),
+    "#": re.compile(r"#[^\n]*", RE_FLAGS),
+}
+
+
+def split_sections(text):  # type: (str) -> list[(int, int)]
+    """Find the (start, end) span of the root section and of every table header and its key/value pairs.
+
+    Headers are only recognized at the start of a line and outside of strings, comments and arrays.
+    The first span always belongs to the root table, and may be empty. If the text is malformed, the
+    spans may not line up with real headers, but decoding the sections will then fail like the document would.
+    """
+    starts = [0]
+    depth = 0
+    line_start = 0
+    pos = 0
+
+    while True:
+        matched = _token_regex.search(text, pos)
+        if matched is None:
+            break
+
+        token = matched.group()
+        pos = matched.end()
+
+        if token == "\n":
+            line_start = pos
+        elif token in _skip_regexes:
+            skipped = _skip_regexes[token].match(text, matched.start())
+            if skipped is None:
+                # unterminated string, which the decoder will report
+                break
+            pos = skipped.end()
+        elif token in "[{":
+            if depth == 0 and token == "[" and not text[line_start:matched.start()].strip(" \t"):
+                starts.append(line_start)
+            depth += 1
+        elif depth > 0:
+            depth -= 1
+
+    ends = starts[1:] + [len(text)]
+    return list(zip(starts, ends))
@@ -1,9 +1,20 @@
 from __future__ import unicode_literals
 
+import codecs
 import re  # noqa: F401
 
 from .errors import EzTomlDecodeError
 
+buffer_types = bytes, bytearray, memoryview
+
+
+def decode_utf8(buf):
+    """Decode a UTF-8 buffer to text without first copying it to an intermediate bytes object."""
+    try:
+        return codecs.decode(buf, "utf-8")
+    except UnicodeDecodeError as exc:
+        raise EzTomlDecodeError("Invalid UTF-8 at byte {}".format(exc.start))
+
 
 class Source(object):
     def __init__(self, text):  # type: (str) -> None
@@ -42,12 +53,13 @@ class Source(object):
             return self.text[self.pos: self.pos + num_chars]
 
     def peek_match(self, regex):  # type: (re.Pattern) -> str
-        matched = regex.match(self.remaining)
+        # match in place, rather than slicing off a copy of the remaining text
+        matched = regex.match(self.text, self.pos)
         if matched is not None:
-            return self.text[self.pos + matched.start(): self.pos + matched.end()]
+            return matched.group()
 
     def take_match(self, regex):  # type: (re.Pattern) -> str
-        matched = regex.match(self.remaining)
+        matched = regex.match(self.text, self.pos)
         assert matched is not None
         return self.take(matched.end() - matched.start())
 
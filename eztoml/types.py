@@ -1,3 +1,8 @@
+try:
+    from collections.abc import ItemsView, KeysView, Mapping, ValuesView
+except ImportError:
+    from collections import ItemsView, KeysView, Mapping, ValuesView
+
 unicode_type = type(u"")
 string_types = str if unicode_type == str else (str, unicode_type)
 number_types = int, float, type(int(float("1e100")))
@@ -17,3 +22,120 @@ class MultiLineString(str):
 
 class RawMultiLineString(str):
     """Wrapped around \""" style multi-line strings."""
+
+
+class FrozenDict(dict):
+    """Read-only, hashable table returned when decoding with ``frozen=True``."""
+
+    __slots__ = ("_hash",)
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash(frozenset(self.items()))
+            return self._hash
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("{} is immutable".format(type(self).__name__))
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+
+_record_classes = {}
+
+
+def record_class(keys):  # type: (tuple) -> type
+    """Get the :class:`Record` class for a key set, creating it the first time it's seen."""
+    try:
+        return _record_classes[keys]
+    except KeyError:
+        pass
+
+    slots = tuple("_{}".format(i) for i in range(len(keys)))
+    namespace = {"__slots__": slots, "__module__": __name__, "_keys": keys, "_index": dict(zip(keys, slots))}
+    return _record_classes.setdefault(keys, type(str("Record"), (Record,), namespace))
+
+
+def _make_record(keys, values):
+    return record_class(keys)(values)
+
+
+class Record(object):
+    """Read-only table for the rows of an array of tables, decoded with ``compact_records=True``.
+
+    Records with the same keys share a generated class, which holds the keys once and each value in a slot.
+    It's registered as a :class:`~collections.abc.Mapping` instead of inheriting from it, since python 2's
+    abstract base classes don't have ``__slots__``.
+    """
+
+    __slots__ = ()
+    _keys = ()
+    _index = {}
+
+    def __init__(self, values):
+        for slot, value in zip(self.__slots__, values):
+            object.__setattr__(self, slot, value)
+
+    def __getitem__(self, key):
+        try:
+            slot = self._index[key]
+        except (KeyError, TypeError):
+            raise KeyError(key)
+
+        return getattr(self, slot)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        try:
+            return key in self._index
+        except TypeError:
+            return False
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def keys(self):
+        return KeysView(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def values(self):
+        return ValuesView(self)
+
+    def __eq__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+
+        return dict(self.items()) == dict(other.items())
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash(frozenset(self.items()))
+
+    def __reduce__(self):
+        return _make_record, (self._keys, tuple(self.values()))
+
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, dict(self.items()))
+
+    def __setattr__(self, name, value):
+        raise TypeError("{} is immutable".format(type(self).__name__))
+
+    __delattr__ = __setattr__
+
+
+Mapping.register(Record)
@@ -13,6 +13,12 @@ class EzTomlTz(tzinfo):
             h, m = offset_str[1:].split(":")
             self.delta = sign * timedelta(hours=int(h), minutes=int(m))
 
+        self.offset_str = offset_str
+
+    def __getinitargs__(self):
+        """Allow the timezone to be pickled, such as when passing documents between processes."""
+        return (self.offset_str,)
+
     def utcoffset(self, dt):
         """Get the offset from UTC."""
         return self.delta
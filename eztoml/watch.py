@@ -0,0 +1,121 @@
+"""Reloading TOML files when they change on disk."""
+import hashlib
+import os
+import threading
+import traceback
+
+from .decoder import Decoder
+from .diff import diff
+from .errors import EzTomlError
+from .files import open_buffer
+from .source import decode_utf8
+
+
+def _stat_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return stat.st_size, getattr(stat, "st_mtime_ns", stat.st_mtime), stat.st_ino
+
+
+class Watcher(object):
+    """Poll a set of files, and decode them again when they change.
+
+    Files are only read when their size, modification time or inode changed, and only decoded when the
+    hash of their contents changed. The callback receives the path, the new document and the :func:`diff`
+    from the previous version. If a file is removed, the callback receives ``None`` as the document.
+
+    Errors from reading or decoding a file, or from the callback, are passed to ``on_error`` with the path.
+    Without ``on_error``, callback errors are raised from :meth:`poll`, and printed by the background thread,
+    which keeps polling.
+    """
+
+    def __init__(self, paths, callback, interval=1.0, on_error=None, array_key=None, **kwargs):
+        self.paths = list(paths)
+        self.callback = callback
+        self.interval = interval
+        self.on_error = on_error
+        self.array_key = array_key
+        self.decoder = Decoder(**kwargs)
+        self.documents = {}
+        self._signatures = {}
+        self._digests = {}
+        self._stopped = threading.Event()
+        self._thread = None
+        object.__init__(self)
+
+    def poll(self):  # type: () -> list[str]
+        """Check every file once, and return the paths that were decoded again or removed."""
+        updated = []
+
+        for path in self.paths:
+            signature = _stat_signature(path)
+            if path in self._signatures and signature == self._signatures[path]:
+                continue
+
+            self._signatures[path] = signature
+
+            if signature is None:
+                self._digests.pop(path, None)
+                if path in self.documents:
+                    updated.append(path)
+                    self._notify(path, None, diff(self.documents.pop(path), {}, self.array_key))
+                continue
+
+            try:
+                with open_buffer(path) as buf:
+                    digest = hashlib.sha1(buf).digest()
+                    if digest == self._digests.get(path):
+                        continue
+
+                    self._digests[path] = digest
+                    document = self.decoder.decode(decode_utf8(buf))
+            except (EzTomlError, IOError, OSError) as exc:
+                if self.on_error is not None:
+                    self.on_error(path, exc)
+                continue
+
+            updated.append(path)
+            changes = diff(self.documents.get(path, {}), document, self.array_key)
+            self.documents[path] = document
+            self._notify(path, document, changes)
+
+        return updated
+
+    def _notify(self, path, document, changes):
+        try:
+            self.callback(path, document, changes)
+        except Exception as exc:
+            if self.on_error is None:
+                raise
+
+            self.on_error(path, exc)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.poll()
+            except Exception:
+                traceback.print_exc()
+
+            self._stopped.wait(self.interval)
+
+    def start(self):
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="eztoml-watch")
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+
+def watch(paths, callback, interval=1.0, **kwargs):
+    """Start polling files in a background thread, returning the :class:`Watcher`."""
+    return Watcher(paths, callback, interval=interval, **kwargs).start()
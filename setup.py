@@ -32,6 +32,7 @@ setup(
     ],
     packages=['eztoml'],
     tests_require=["PyYAML~=5.3"],
+    extras_require={"numpy": ["numpy"]},
     entry_points={
         'console_scripts': [
             'toml-lint=eztoml:lint_files',
@@ -0,0 +1,27 @@
+"""Annotated schema types for test_schema, which can only be imported on python 3.8 and later."""
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple, TypedDict
+
+
+class Owner(TypedDict):
+    name: str
+    dob: datetime
+
+
+@dataclass
+class Database:
+    ports: List[int]
+    limits: Dict[str, float]
+    ratio: float
+    enabled: bool = True
+
+
+@dataclass
+class Config:
+    title: str
+    released: date
+    owner: Optional[Owner] = None
+    database: Optional[Database] = None
+    children: List["Config"] = field(default_factory=list)
+    point: Tuple[int, int] = (0, 0)
@@ -0,0 +1,88 @@
+from __future__ import unicode_literals
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import unittest
+
+import eztoml
+
+if sys.version_info >= (3, 5):
+    import asyncio
+    from eztoml import aio
+else:
+    # async functions are new in python 3.5
+    asyncio = aio = None
+
+src = "".join('[section{0}]\nindex = {0}\nname = "{0}"\n'.format(i) for i in range(100))
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+@unittest.skipIf(aio is None, "eztoml.aio requires python 3.5")
+class TestAsyncio(unittest.TestCase):
+    def test_loads(self):
+        self.assertDictEqual(run(aio.loads(src, chunk_size=128)), eztoml.loads(src))
+        self.assertDictEqual(run(aio.loads(src.encode("utf-8"))), eztoml.loads(src))
+        self.assertDictEqual(run(aio.loads(src, executor="thread")), eztoml.loads(src))
+
+    def test_yields(self):
+        loop = asyncio.new_event_loop()
+        ticks = []
+
+        # callbacks only run when the decoding task yields to the loop
+        def tick():
+            ticks.append(None)
+            loop.call_soon(tick)
+
+        try:
+            loop.call_soon(tick)
+            loop.run_until_complete(aio.loads(src, chunk_size=128))
+        finally:
+            loop.close()
+
+        self.assertGreater(len(ticks), 10)
+
+    def test_process(self):
+        self.assertDictEqual(run(aio.loads(src, executor="process")), eztoml.loads(src))
+        pool = aio._process_pool
+        self.assertDictEqual(run(aio.loads(src, executor="process")), eztoml.loads(src))
+        self.assertIs(aio._process_pool, pool)
+
+    def test_errors(self):
+        with self.assertRaises(eztoml.EzTomlDecodeError):
+            run(aio.loads(src + "[section1]\n"))
+
+    def test_paths(self):
+        tmp_dir = tempfile.mkdtemp()
+        path = os.path.join(tmp_dir, "doc.toml")
+
+        try:
+            run(aio.dump_path(eztoml.loads(src), path, sort_keys=True))
+            self.assertDictEqual(run(aio.load_path(path)), eztoml.loads(src))
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    @unittest.skipUnless(os.name == "posix", "file modes are only checked on posix")
+    def test_dump_path_mode(self):
+        tmp_dir = tempfile.mkdtemp()
+        path = os.path.join(tmp_dir, "doc.toml")
+        umask = os.umask(0o022)
+
+        try:
+            run(aio.dump_path({"a": 1}, path))
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o644)
+
+            os.chmod(path, 0o640)
+            run(aio.dump_path({"a": 2}, path))
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o640)
+        finally:
+            os.umask(umask)
+            shutil.rmtree(tmp_dir)
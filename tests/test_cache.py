@@ -0,0 +1,60 @@
+from __future__ import unicode_literals
+import unittest
+
+import eztoml
+
+
+class TestParseCache(unittest.TestCase):
+    def test_hits_and_copies(self):
+        cache = eztoml.ParseCache()
+        first = eztoml.loads("a = [1, 2]", cache=cache)
+        first["a"].append(3)
+
+        second = eztoml.loads("a = [1, 2]", cache=cache)
+        self.assertDictEqual(second, {"a": [1, 2]})
+        self.assertEqual(cache.info().hits, 1)
+        self.assertEqual(cache.info().misses, 1)
+
+    def test_shared(self):
+        cache = eztoml.ParseCache(copy=False)
+        document = cache.loads("a = [1]")
+
+        self.assertIs(document, cache.loads(b"a = [1]"))
+        self.assertIsInstance(document, eztoml.types.FrozenDict)
+        self.assertEqual(document["a"], (1,))
+
+        with self.assertRaises(TypeError):
+            document["b"] = 2
+
+    def test_mutable_options(self):
+        cache = eztoml.ParseCache(copy=False)
+        first = cache.loads("a = [1]", array_factory=list)
+        first["a"].append(2)
+
+        self.assertEqual(cache.loads("a = [1]", array_factory=list)["a"], [1])
+
+    def test_options_in_key(self):
+        cache = eztoml.ParseCache(copy=False)
+        plain = cache.loads("a = 'b'")
+        styled = cache.loads("a = 'b'", preserve_style=True)
+
+        self.assertIsNot(plain, styled)
+        self.assertIsInstance(styled["a"], eztoml.types.RawInlineString)
+
+    def test_eviction(self):
+        cache = eztoml.ParseCache(maxsize=2)
+        for src in ("a = 1", "b = 2", "a = 1", "c = 3"):
+            cache.loads(src)
+
+        self.assertEqual(cache.info().size, 2)
+        self.assertEqual(cache.info().evictions, 1)
+
+        # "a = 1" was used more recently, so "b = 2" was evicted
+        cache.loads("a = 1")
+        self.assertEqual(cache.info().hits, 2)
+
+        by_size = eztoml.ParseCache(max_bytes=10)
+        by_size.loads("a = 1")
+        by_size.loads("b = 2")
+        by_size.loads("c = 3")
+        self.assertEqual(by_size.info().nbytes, 10)
@@ -0,0 +1,70 @@
+from __future__ import unicode_literals
+import unittest
+from array import array
+
+import eztoml
+from eztoml.decoder import _INT_TYPECODE
+
+src = """
+title = "samples"
+
+[[samples]]
+t = 1
+value = 1.5
+
+[[samples]]
+t = 2
+value = 2.5
+label = "b"
+
+[[samples]]
+t = 3
+value = 3.5
+"""
+
+
+class TestColumnar(unittest.TestCase):
+    def test_columns(self):
+        document = eztoml.loads(src, columnar=["samples"], columnar_fill=None)
+
+        self.assertEqual(document["title"], "samples")
+        self.assertDictEqual(
+            document["samples"], {"t": [1, 2, 3], "value": [1.5, 2.5, 3.5], "label": [None, "b", None]}
+        )
+
+    def test_numeric_columns(self):
+        document = eztoml.loads(src, columnar=["samples"], columnar_fill="", numeric_columns=True)
+
+        self.assertEqual(document["samples"]["t"], array(_INT_TYPECODE, [1, 2, 3]))
+        self.assertEqual(document["samples"]["value"], array("d", [1.5, 2.5, 3.5]))
+        self.assertEqual(document["samples"]["label"], ["", "b", ""])
+
+    def test_frozen(self):
+        document = eztoml.loads(src, columnar=["samples"], columnar_fill=None, frozen=True)
+        self.assertEqual(document["samples"]["t"], (1, 2, 3))
+        self.assertIsInstance(document["samples"], eztoml.types.FrozenDict)
+
+    def test_nested_path(self):
+        nested = "[[runs]]\n[[runs.samples]]\nx = 1\n[[runs]]\n[[runs.samples]]\nx = 2\n[[runs.samples]]\nx = 3\n"
+        document = eztoml.loads(nested, columnar=[("runs", "samples")])
+        self.assertEqual(document, {"runs": [{"samples": {"x": [1]}}, {"samples": {"x": [2, 3]}}]})
+        self.assertEqual(eztoml.loads(nested, columnar=["runs.samples"], cache=True), document)
+
+    def test_missing_key(self):
+        with self.assertRaises(eztoml.EzTomlDecodeError):
+            eztoml.loads(src, columnar=["samples"])
+
+    def test_invalid(self):
+        rows = "[[samples]]\nt = 1\n"
+        invalid = [
+            rows + "[samples.meta]\n",
+            rows + "[[samples.meta]]\n",
+            rows + "[samples]\n",
+            "samples = 1\n" + rows,
+            "[[samples]]\na.b = 1\n",
+            "[[samples]]\na = 1\na = 2\n",
+        ]
+
+        for text in invalid:
+            with self.assertRaises(eztoml.EzTomlDecodeError):
+                eztoml.loads(text, columnar=["samples"])
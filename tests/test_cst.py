@@ -0,0 +1,95 @@
+from __future__ import unicode_literals
+import unittest
+
+import eztoml
+
+src = """# top comment
+title = "x"   # trailing
+inline = {a = 1, b = [1, 2]}
+dotted.key = 5
+
+[package]
+  name = "eztoml"
+  version = "0.1.0" # bump me
+
+[[servers]]
+host = 'a'
+
+[[servers]]
+host = 'b'
+
+  [servers.meta]
+  x = 1
+
+[deps]
+numpy = "*"
+"""
+
+
+class TestConcreteDocument(unittest.TestCase):
+    def assert_edit(self, document, expected):
+        encoded = eztoml.dumps(document)
+        self.assertEqual(encoded, expected)
+        self.assertEqual(eztoml.loads(encoded), document.value)
+
+    def test_untouched(self):
+        document = eztoml.parse_document(src)
+
+        self.assertEqual(document.dumps(), src)
+        self.assertEqual(document, eztoml.loads(src))
+        self.assertEqual(document["servers"][1]["meta"]["x"], 1)
+
+    def test_change_value(self):
+        document = eztoml.parse_document(src)
+        document["package"]["version"] = "1.2.3"
+        document["servers"][0]["host"] = "c"
+        document["inline"]["a"] = 2
+
+        expected = (
+            src.replace('"0.1.0" # bump me', '"1.2.3" # bump me')
+            .replace("host = 'a'", 'host = "c"')
+            .replace("{a = 1, b = [1, 2]}", "{a = 2, b = [1, 2]}")
+        )
+        self.assert_edit(document, expected)
+
+    def test_add_keys(self):
+        document = eztoml.parse_document(src)
+        document["package"]["license"] = "MIT"
+        document["dotted"]["other"] = 1
+        document["servers"][1]["meta"]["y"] = [1, 2]
+
+        expected = (
+            src.replace('# bump me\n', '# bump me\n  license = "MIT"\n')
+            .replace("dotted.key = 5\n", "dotted.key = 5\ndotted.other = 1\n")
+            .replace("  x = 1\n", "  x = 1\n  y = [1, 2]\n")
+        )
+        self.assert_edit(document, expected)
+
+    def test_remove(self):
+        document = eztoml.parse_document(src)
+        del document["deps"]
+        del document["dotted"]
+        del document["package"]["name"]
+
+        expected = src.replace('[deps]\nnumpy = "*"\n', "").replace("dotted.key = 5\n", "")
+        self.assert_edit(document, expected.replace('  name = "eztoml"\n', ""))
+
+    def test_replace_tables(self):
+        document = eztoml.parse_document(src)
+        document["servers"] = [{"host": "z"}]
+        document["tool"] = {"name": "t"}
+
+        expected = (
+            src[: src.index("[[servers]]")] + '[deps]\nnumpy = "*"\n\n[[servers]]\nhost = "z"\n\n[tool]\nname = "t"\n'
+        )
+        self.assert_edit(document, expected)
+
+    def test_empty(self):
+        document = eztoml.parse_document("")
+        document["a"] = 1
+        document["t"] = {"x": 1}
+        self.assert_edit(document, 'a = 1\n\n[t]\nx = 1\n')
+
+    def test_invalid(self):
+        with self.assertRaises(eztoml.EzTomlDecodeError):
+            eztoml.parse_document("a = 1\na = 2\n")
@@ -1,5 +1,8 @@
+# -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 import unittest
+from collections import OrderedDict
+from decimal import Decimal
 
 import eztoml
 import eztoml.source
@@ -39,3 +42,54 @@ hello \
         """''',
             "hello world",
         )
+
+    def test_buffer_input(self):
+        encoded = 'name = "ʎǝʞ"\nvalues = [1, 2]\n'.encode("utf-8")
+        expected = {"name": "ʎǝʞ", "values": [1, 2]}
+
+        self.assertDictEqual(self.decoder.decode(encoded), expected)
+        self.assertDictEqual(self.decoder.decode(bytearray(encoded)), expected)
+        self.assertDictEqual(self.decoder.decode(memoryview(encoded)), expected)
+
+        with self.assertRaises(eztoml.EzTomlDecodeError):
+            self.decoder.decode(b'name = "\xff"')
+
+
+class TestDecodeHooks(unittest.TestCase):
+    src = """
+a = 1.5
+b = 0x10
+c = [1, 2.0, -inf]
+d = 1979-05-27T07:32:00Z
+e = 1979-05-27
+
+[t]
+x = {y = [1_000]}
+
+[[arr]]
+k = 1
+
+[[arr]]
+k = 2
+"""
+
+    def test_scalar_hooks(self):
+        document = eztoml.loads(self.src, parse_float=Decimal, parse_int=lambda s: "i" + s, parse_datetime=str)
+
+        self.assertEqual(document["a"], Decimal("1.5"))
+        self.assertEqual(document["b"], "i16")
+        self.assertEqual(document["c"], ["i1", Decimal("2.0"), Decimal("-inf")])
+        self.assertEqual(document["d"], "1979-05-27T07:32:00Z")
+        self.assertEqual(document["t"]["x"]["y"], ["i1000"])
+
+    def test_container_factories(self):
+        document = eztoml.loads(self.src, table_factory=OrderedDict, array_factory=tuple)
+
+        self.assertIs(type(document), OrderedDict)
+        self.assertEqual(list(document), ["a", "b", "c", "d", "e", "t", "arr"])
+        self.assertIs(type(document["t"]["x"]), OrderedDict)
+        self.assertEqual(document["c"], (1, 2.0, float("-inf")))
+        self.assertEqual(document["arr"], (OrderedDict(k=1), OrderedDict(k=2)))
+
+        with self.assertRaises(eztoml.EzTomlDecodeError):
+            eztoml.loads("a = 1\n[a]\n", table_factory=OrderedDict)
@@ -0,0 +1,81 @@
+from __future__ import unicode_literals
+import unittest
+
+import eztoml
+
+old_src = """
+name = "service"
+replicas = 2
+ratio = nan
+
+[limits]
+cpu = 1
+memory = "1G"
+
+[[products]]
+name = "Hammer"
+price = 10
+
+[[products]]
+name = "Nail"
+price = 1
+"""
+
+new_src = """
+name = "service"
+replicas = 3
+ratio = nan
+
+[limits]
+cpu = 1
+
+[[products]]
+name = "Nail"
+price = 2
+
+[[products]]
+name = "Screw"
+price = 1
+
+[owner]
+name = "Tom"
+"""
+
+
+class TestDiff(unittest.TestCase):
+    def test_identical(self):
+        document = eztoml.loads(old_src)
+        self.assertEqual(eztoml.diff(document, document), ([], [], []))
+        self.assertEqual(eztoml.diff(document, eztoml.loads(old_src)), ([], [], []))
+
+    def test_by_index(self):
+        changes = eztoml.diff(eztoml.loads(old_src), eztoml.loads(new_src))
+
+        self.assertListEqual(changes.added, [("owner",)])
+        self.assertListEqual(changes.removed, [("limits", "memory")])
+        self.assertListEqual(
+            sorted(changes.changed),
+            [("products", 0, "name"), ("products", 0, "price"), ("products", 1, "name"), ("replicas",)],
+        )
+
+    def test_by_key(self):
+        changes = eztoml.diff(eztoml.loads(old_src, frozen=True), eztoml.loads(new_src, frozen=True), array_key="name")
+
+        self.assertListEqual(sorted(changes.added), [("owner",), ("products", "Screw")])
+        self.assertListEqual(sorted(changes.removed), [("limits", "memory"), ("products", "Hammer")])
+        self.assertListEqual(sorted(changes.changed), [("products", "Nail", "price"), ("replicas",)])
+
+    def test_types(self):
+        self.assertEqual(eztoml.diff({"a": 1}, {"a": "1"}).changed, [("a",)])
+        self.assertEqual(eztoml.diff({"a": {"b": 1}}, {"a": 1}).changed, [("a",)])
+        self.assertEqual(eztoml.diff({"a": [1, 2]}, {"a": [1]}).changed, [("a",)])
+
+    def test_toml_types(self):
+        self.assertEqual(eztoml.diff({"a": 1}, {"a": True}).changed, [("a",)])
+        self.assertEqual(eztoml.diff({"a": 1}, {"a": 1.0}).changed, [("a",)])
+        self.assertEqual(eztoml.diff({"a": {"b": [1, 2]}}, {"a": {"b": [1, 2.0]}}).changed, [("a", "b")])
+        self.assertEqual(eztoml.diff({"a": [{"b": 0}]}, {"a": [{"b": False}]}).changed, [("a", 0, "b")])
+        self.assertEqual(eztoml.diff({"a": [[{"b": 1}]]}, {"a": [[{"b": 1.0}]]}).changed, [("a",)])
+
+        old, new = eztoml.loads("port = 1\n", frozen=True), eztoml.loads("port = true\n", frozen=True)
+        self.assertEqual(eztoml.diff(old, new).changed, [("port",)])
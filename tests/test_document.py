@@ -0,0 +1,89 @@
+from __future__ import unicode_literals
+import io
+import os
+import unittest
+
+import eztoml
+from eztoml.sections import split_sections
+
+test_dir = os.path.dirname(os.path.abspath(__file__))
+
+src = """
+title = "incremental"
+owner.name = "Tom"
+
+[database]
+ports = [
+  [8001, 8002],
+]
+notes = '''
+[not.a.table]
+'''
+
+[servers.alpha]
+ip = "10.0.0.1"  # [comment]
+
+[[products]]
+name = "Hammer"
+
+[[products]]
+name = "Nail"
+"""
+
+
+class TestSections(unittest.TestCase):
+    def test_split(self):
+        sections = [src[start:end] for start, end in split_sections(src)]
+        headers = [section.split("\n")[0] for section in sections[1:]]
+
+        self.assertEqual("".join(sections), src)
+        self.assertListEqual(headers, ["[database]", "[servers.alpha]", "[[products]]", "[[products]]"])
+
+    def test_leading_header(self):
+        self.assertListEqual(split_sections("[a]\nb = 1\n"), [(0, 0), (0, 10)])
+
+
+class TestDocument(unittest.TestCase):
+    def assert_update(self, document, text):
+        self.assertDictEqual(document.update(text), eztoml.loads(text))
+        self.assertEqual(document.text, text)
+
+    def test_update(self):
+        document = eztoml.Document(src)
+        self.assertDictEqual(document.value, eztoml.loads(src))
+        servers = document.value["servers"]
+
+        self.assert_update(document, src.replace('"Nail"', '"Screw"'))
+        self.assertIs(document.value["servers"], servers)
+
+        self.assert_update(document, src.replace('title = "incremental"', 'title = "edited"\nversion = 2'))
+        self.assert_update(document, src.replace("[servers.alpha]", "[servers.beta]"))
+        self.assert_update(document, src + '\n[servers.beta]\nip = "10.0.0.2"\n')
+        self.assert_update(document, src.replace('[[products]]\nname = "Hammer"\n', ""))
+
+    def test_edit(self):
+        document = eztoml.Document(src)
+        start = src.index("8001")
+        self.assertEqual(document.edit(start, start + 4, "9001")["database"]["ports"], [[9001, 8002]])
+
+    def test_errors(self):
+        document = eztoml.Document(src)
+
+        with self.assertRaises(eztoml.EzTomlDecodeError):
+            document.update(src + "\n[database]\n")
+
+        # a failed update leaves the document untouched
+        self.assertEqual(document.text, src)
+        self.assert_update(document, src + "\n[database.replica]\nport = 1\n")
+
+    def test_frozen(self):
+        document = eztoml.Document(src, frozen=True)
+        document.update(src.replace('"Nail"', '"Screw"'))
+        self.assertEqual(document.value, eztoml.loads(src.replace('"Nail"', '"Screw"'), frozen=True))
+
+    def test_examples(self):
+        for name in ("example.toml", "example-v0.4.0.toml", "hard_example.toml", "fruit.toml"):
+            with io.open(os.path.join(test_dir, "files", name), "rt", encoding="utf-8") as f:
+                text = f.read()
+
+            self.assertDictEqual(eztoml.Document(text).value, eztoml.loads(text))
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+import unittest
+from collections import namedtuple
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+try:
+    import dataclasses
+except ImportError:
+    dataclasses = None
+
+import eztoml
+from eztoml import encoder
+
+Point = namedtuple("Point", "x y")
+
+
+class Slotted(object):
+    __slots__ = ("name", "point", "_hidden", "unset")
+
+    def __init__(self, name, point):
+        self.name = name
+        self.point = point
+        self._hidden = True
+
+
+class ReadOnly(Mapping):
+    def __init__(self, data):
+        self._data = data
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TestEncodeObjects(unittest.TestCase):
+    def assert_encodes(self, document, expected):
+        self.assertEqual(eztoml.dumps(document, sort_keys=True), eztoml.dumps(expected, sort_keys=True))
+
+    def test_namedtuple(self):
+        self.assert_encodes({"a": Point(1, 2)}, {"a": {"x": 1, "y": 2}})
+        self.assert_encodes({"a": [Point(1, 2), Point(3, 4)]}, {"a": [{"x": 1, "y": 2}, {"x": 3, "y": 4}]})
+        self.assert_encodes({"a": [[Point(1, 2)]]}, {"a": [[{"x": 1, "y": 2}]]})
+
+    def test_slots(self):
+        self.assert_encodes({"s": Slotted("n", Point(1, 2))}, {"s": {"name": "n", "point": {"x": 1, "y": 2}}})
+
+    def test_mapping(self):
+        self.assert_encodes(ReadOnly({"a": 1, "b": ReadOnly({"c": "d"})}), {"a": 1, "b": {"c": "d"}})
+
+    @unittest.skipUnless(dataclasses, "requires dataclasses")
+    def test_dataclass(self):
+        Server = dataclasses.make_dataclass("Server", [("host", str), ("ports", list), ("owner", Point)])
+        document = {"servers": [Server("a", [1, 2], Point(0, 1))]}
+        expected = {"servers": [{"host": "a", "ports": [1, 2], "owner": {"x": 0, "y": 1}}]}
+        self.assert_encodes(document, expected)
+        self.assert_encodes(Server("a", [1, 2], Point(0, 1)), expected["servers"][0])
+
+    def test_plans_cached(self):
+        eztoml.dumps({"a": Point(1, 2)})
+        plan = encoder._field_plans[Point]
+        eztoml.dumps({"a": Point(3, 4)})
+        self.assertIs(encoder._field_plans[Point], plan)
+
+    def test_not_a_table(self):
+        for value in ("a", 1, [1], Point):
+            self.assertRaises(eztoml.EzTomlEncodeError, eztoml.dumps, value)
+        self.assertRaises(eztoml.EzTomlEncodeError, eztoml.dumps, {"a": object()})
+
+
+class CountingWriter(list):
+    def write(self, data):
+        self.append(data)
+
+
+class TestIterEncode(unittest.TestCase):
+    document = {"t{}".format(i): {"a": i, "b": "s{}".format(i), "sub": {"x": [1.5, 2.5]}} for i in range(200)}
+
+    def test_chunks(self):
+        chunks = list(encoder.Encoder(sort_keys=True).iterencode(self.document))
+
+        self.assertGreater(len(chunks), 200)
+        self.assertEqual("".join(chunks), eztoml.dumps(self.document, sort_keys=True))
+
+    def test_dump_buffered(self):
+        writer = CountingWriter()
+        eztoml.dump(self.document, writer, buffer_size=1024)
+
+        self.assertGreater(len(writer), 1)
+        self.assertTrue(all(len(chunk) < 2048 for chunk in writer))
+        self.assertEqual("".join(writer), eztoml.dumps(self.document))
+
+        writer = CountingWriter()
+        eztoml.dump(self.document, writer)
+        self.assertEqual(len(writer), 1)
+
+
+class TestCollectTables(unittest.TestCase):
+    def test_order_and_depth(self):
+        document = {"b": {"x": 1, "c": {"y": 2}}, "a": [{"z": 3}, {"z": 4}], "only": {"nested": {"k": 5}}, "v": 0}
+        tables = encoder.Encoder(sort_keys=True)._collect_tables(document)
+
+        self.assertEqual(
+            [(table.path, table.is_array, table.depth, table.kv) for table in tables],
+            [
+                ((), False, 0, [("v", 0)]),
+                (("a",), True, 0, [("z", 3)]),
+                (("a",), True, 0, [("z", 4)]),
+                (("b",), False, 0, [("x", 1)]),
+                (("b", "c"), False, 1, [("y", 2)]),
+                (("only", "nested"), False, 0, [("k", 5)]),
+            ],
+        )
+
+
+class TestEscape(unittest.TestCase):
+    def test_unchanged(self):
+        for value in ("plain ascii", "中文 and é", "☃", ""):
+            self.assertIs(encoder.escape(value), value)
+
+    def test_short_escapes(self):
+        self.assertEqual(encoder.escape('a "b" \\ c\t\n'), 'a \\"b\\" \\\\ c\\t\\n')
+        self.assertEqual(encoder.escape_multi_line('a "b" \\ c\t'), 'a "b" \\\\ c\\t')
+
+    def test_unicode_escapes(self):
+        self.assertEqual(
+            encoder.escape("\x01 \x7f \xa0 \u200d \U000e0001 é"), "\\u0001 \\u007f \\u00a0 \\u200d \\U000e0001 é"
+        )
+
+    def test_should_unicode_escape(self):
+        self.assertFalse(encoder.should_unicode_escape("tab\tnewline\n 中文"))
+        self.assertTrue(encoder.should_unicode_escape("zero\u200bwidth"))
+
+    def test_round_trip(self):
+        document = {"a": "\x01\x1f\"\\ 中文 😀 ", "b": "line\nline \u200d"}
+        self.assertEqual(eztoml.loads(eztoml.dumps(document)), document)
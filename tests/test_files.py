@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from decimal import Decimal
+
+import eztoml
+
+
+class TestLoadPath(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, name, contents):
+        path = os.path.join(self.tmp_dir, name)
+        with io.open(path, "wb") as f:
+            f.write(contents)
+        return path
+
+    def test_load_path(self):
+        path = self.write("a.toml", 'name = "ʎǝʞ"\n[table]\nkey = 1\n'.encode("utf-8"))
+        expected = {"name": "ʎǝʞ", "table": {"key": 1}}
+
+        self.assertDictEqual(eztoml.load_path(path), expected)
+        self.assertDictEqual(eztoml.load_path(path, mmap=False), expected)
+
+    def test_empty_file(self):
+        path = self.write("empty.toml", b"")
+        self.assertDictEqual(eztoml.load_path(path), {})
+
+    def test_invalid_utf8(self):
+        path = self.write("invalid.toml", b'name = "\xff"\n')
+
+        with self.assertRaises(eztoml.EzTomlDecodeError):
+            eztoml.load_path(path)
+
+
+class TestSnapshotCache(unittest.TestCase):
+    src = (
+        'title = "TOML"\n'
+        "dob = 1979-05-27T07:32:00-08:00\n"
+        "when = 1979-05-27T07:32:00.500Z\n"
+        "local = 1979-05-27T07:32:00\n"
+        "day = 1979-05-27\n"
+        "at = 07:32:00.999\n"
+        "[[points]]\n"
+        "x = 1.5\n"
+        "flag = true\n"
+    )
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, "cache")
+        self.path = os.path.join(self.tmp_dir, "doc.toml")
+        self.write(self.src)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, contents):
+        with io.open(self.path, "wt", encoding="utf-8") as f:
+            f.write(contents)
+
+    def snapshots(self):
+        return [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)]
+
+    def test_round_trip(self):
+        expected = eztoml.loads(self.src)
+        self.assertDictEqual(eztoml.load_path(self.path, cache_dir=self.cache_dir), expected)
+        self.assertEqual(len(self.snapshots()), 1)
+
+        cached = eztoml.load_path(self.path, cache_dir=self.cache_dir)
+        self.assertDictEqual(cached, expected)
+        self.assertEqual(cached["dob"].utcoffset(), expected["dob"].utcoffset())
+
+    def test_preserve_style(self):
+        eztoml.load_path(self.path, cache_dir=self.cache_dir, preserve_style=True)
+        cached = eztoml.load_path(self.path, cache_dir=self.cache_dir, preserve_style=True)
+        self.assertIsInstance(cached["title"], eztoml.types.InlineString)
+
+    def test_frozen(self):
+        expected = eztoml.loads(self.src, frozen=True)
+        eztoml.load_path(self.path, cache_dir=self.cache_dir, frozen=True)
+        cached = eztoml.load_path(self.path, cache_dir=self.cache_dir, frozen=True)
+
+        self.assertEqual(cached, expected)
+        self.assertIsInstance(cached["points"], tuple)
+        self.assertIsInstance(cached["points"][0], eztoml.types.FrozenDict)
+
+    def test_hooks(self):
+        hooks = {
+            "table_factory": eztoml.types.FrozenDict,
+            "array_factory": tuple,
+            "parse_float": Decimal,
+            "parse_int": str,
+            "parse_datetime": str,
+        }
+
+        for name, hook in hooks.items():
+            first = eztoml.load_path(self.path, cache_dir=self.cache_dir, **{name: hook})
+            second = eztoml.load_path(self.path, cache_dir=self.cache_dir, **{name: hook})
+
+            self.assertEqual(first, second)
+            self.assertIs(type(second), type(first))
+            self.assertIs(type(second["points"]), type(first["points"]))
+            self.assertIs(type(second["points"][0]["x"]), type(first["points"][0]["x"]))
+            self.assertIs(type(second["dob"]), type(first["dob"]))
+
+    def test_modified(self):
+        eztoml.load_path(self.path, cache_dir=self.cache_dir)
+        self.write('title = "changed, and a different size"\n')
+        self.assertDictEqual(
+            eztoml.load_path(self.path, cache_dir=self.cache_dir), {"title": "changed, and a different size"}
+        )
+
+    def test_corrupted(self):
+        eztoml.load_path(self.path, cache_dir=self.cache_dir)
+        snapshot_path, = self.snapshots()
+
+        with io.open(snapshot_path, "r+b") as f:
+            f.seek(40)
+            f.truncate()
+
+        self.assertDictEqual(eztoml.load_path(self.path, cache_dir=self.cache_dir), eztoml.loads(self.src))
+
+    def test_prune(self):
+        cache = eztoml.SnapshotCache(self.cache_dir)
+        cache.load_path(self.path)
+        self.assertEqual(cache.prune(), 0)
+
+        os.remove(self.path)
+        self.assertEqual(cache.prune(), 1)
+        self.assertListEqual(self.snapshots(), [])
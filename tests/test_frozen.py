@@ -0,0 +1,71 @@
+from __future__ import unicode_literals
+import copy
+import pickle
+import unittest
+
+import eztoml
+from eztoml.types import FrozenDict
+
+src = """
+name = "frozen"
+values = [1, [2, 3]]
+inline = {a = 1}
+
+[table.sub]
+key = "value"
+
+[[points]]
+x = 1
+
+[[points]]
+x = 2
+
+[[points.tags]]
+name = "a"
+"""
+
+
+class TestFrozen(unittest.TestCase):
+    def test_frozen_types(self):
+        document = eztoml.loads(src, frozen=True)
+
+        self.assertIsInstance(document, FrozenDict)
+        self.assertIsInstance(document["inline"], FrozenDict)
+        self.assertIsInstance(document["table"]["sub"], FrozenDict)
+        self.assertEqual(document["values"], (1, (2, 3)))
+        self.assertIsInstance(document["points"], tuple)
+        self.assertIsInstance(document["points"][1]["tags"], tuple)
+
+    def test_immutable(self):
+        document = eztoml.loads(src, frozen=True)
+
+        with self.assertRaises(TypeError):
+            document["name"] = "thawed"
+
+        with self.assertRaises(TypeError):
+            document["table"].update({"other": 1})
+
+        with self.assertRaises(TypeError):
+            del document["points"]
+
+    def test_hashable(self):
+        first = eztoml.loads(src, frozen=True)
+        second = eztoml.loads(src, frozen=True)
+
+        self.assertEqual(hash(first), hash(second))
+        self.assertEqual(len({first, second}), 1)
+
+    def test_copy_and_pickle(self):
+        document = eztoml.loads(src, frozen=True)
+
+        for copied in (copy.deepcopy(document), pickle.loads(pickle.dumps(document))):
+            self.assertIsInstance(copied, FrozenDict)
+            self.assertEqual(copied, document)
+
+    def test_encode(self):
+        document = eztoml.loads(src, frozen=True)
+        self.assertEqual(eztoml.dumps(document), eztoml.dumps(eztoml.loads(src)))
+
+    def test_cache_shares(self):
+        cache = eztoml.ParseCache()
+        self.assertIs(cache.loads(src, frozen=True), cache.loads(src, frozen=True))
@@ -0,0 +1,87 @@
+from __future__ import unicode_literals
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+import eztoml
+from eztoml.types import FrozenDict
+
+base_src = """
+name = "service"
+
+[limits]
+cpu = 1
+memory = "1G"
+
+[logging]
+level = "info"
+
+[[listeners]]
+name = "http"
+port = 80
+
+[[listeners]]
+name = "admin"
+port = 9000
+"""
+
+overlay_src = """
+[limits]
+cpu = 4
+
+[[listeners]]
+name = "http"
+port = 8080
+
+[[listeners]]
+name = "https"
+port = 443
+"""
+
+
+class TestMerge(unittest.TestCase):
+    def test_merge(self):
+        base = eztoml.loads(base_src)
+        merged = eztoml.merge(base, eztoml.loads(overlay_src), {"name": "renamed"})
+
+        self.assertEqual(merged["name"], "renamed")
+        self.assertDictEqual(merged["limits"], {"cpu": 4, "memory": "1G"})
+        self.assertListEqual(merged["listeners"], [{"name": "http", "port": 8080}, {"name": "https", "port": 443}])
+
+        # untouched tables are shared, and the inputs aren't modified
+        self.assertIs(merged["logging"], base["logging"])
+        self.assertDictEqual(base, eztoml.loads(base_src))
+
+    def test_array_key(self):
+        base = eztoml.loads(base_src)
+        merged = eztoml.merge(base, eztoml.loads(overlay_src), array_key="name")
+
+        self.assertListEqual(
+            merged["listeners"],
+            [{"name": "http", "port": 8080}, {"name": "admin", "port": 9000}, {"name": "https", "port": 443}],
+        )
+        self.assertIs(merged["listeners"][1], base["listeners"][1])
+
+    def test_frozen(self):
+        base, overlay = eztoml.loads(base_src, frozen=True), eztoml.loads(overlay_src, frozen=True)
+        merged = eztoml.merge(base, overlay, array_key="name")
+
+        self.assertIsInstance(merged, FrozenDict)
+        self.assertIsInstance(merged["limits"], FrozenDict)
+        self.assertIsInstance(merged["listeners"], tuple)
+
+    def test_load_layers(self):
+        tmp_dir = tempfile.mkdtemp()
+        paths = [os.path.join(tmp_dir, name) for name in ("base.toml", "overlay.toml")]
+
+        try:
+            for path, contents in zip(paths, (base_src, overlay_src)):
+                with io.open(path, "wt", encoding="utf-8") as f:
+                    f.write(contents)
+
+            merged = eztoml.load_layers(paths)
+            self.assertEqual(merged["limits"]["cpu"], 4)
+        finally:
+            shutil.rmtree(tmp_dir)
@@ -0,0 +1,81 @@
+from __future__ import unicode_literals
+import unittest
+from decimal import Decimal
+
+import eztoml
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipUnless(numpy, "requires numpy")
+class TestNumericArrays(unittest.TestCase):
+    def loads(self, src, **kwargs):
+        return eztoml.loads(src, numeric_arrays="numpy", **kwargs)
+
+    def test_ndarrays(self):
+        document = self.loads("a = [1, 2, 3]\nb = [\n  [1.5, 2e1],\n  [-3.0, 4_0.5],\n]\nc = [[[1], [2]]]\n")
+
+        self.assertEqual(document["a"].dtype, numpy.int64)
+        self.assertEqual(document["a"].tolist(), [1, 2, 3])
+        self.assertEqual(document["b"].dtype, numpy.float64)
+        self.assertEqual(document["b"].tolist(), [[1.5, 20.0], [-3.0, 40.5]])
+        self.assertEqual(document["c"].shape, (1, 2, 1))
+
+    def test_fallback(self):
+        src = "\n".join(
+            [
+                "ragged = [[1, 2], [3]]",
+                "mixed = [1, 2.5]",
+                "strings = [1, 'a']",
+                "empty = []",
+                "big = [99999999999999999999]",
+                "special = [inf, 1.0]",
+                "comment = [1, # one\n 2]",
+            ]
+        )
+        document = self.loads(src)
+
+        for key in ("ragged", "mixed", "strings", "empty", "big", "special", "comment"):
+            self.assertEqual(document[key], eztoml.loads(src)[key])
+
+    def test_invalid(self):
+        for src in ("a = [01]", "a = [1 2]", "a = [1,,2]", "a = [[1, 2]"):
+            with self.assertRaises(eztoml.EzTomlDecodeError):
+                self.loads(src)
+
+    def test_frozen(self):
+        self.assertFalse(self.loads("a = [1.0]", frozen=True)["a"].flags.writeable)
+
+    def test_encode(self):
+        document = {
+            "a": numpy.arange(4).reshape(2, 2),
+            "b": numpy.array([1.5, 2.0]),
+            "c": numpy.int32(3),
+            "d": numpy.float64(1.5),
+            "e": numpy.array([0.5])[0],
+        }
+        expected = {"a": [[0, 1], [2, 3]], "b": [1.5, 2.0], "c": 3, "d": 1.5, "e": 0.5}
+
+        self.assertEqual(eztoml.dumps(document), eztoml.dumps(expected))
+        self.assertEqual(eztoml.loads(eztoml.dumps(document)), expected)
+
+    def test_diff(self):
+        old = eztoml.loads("a = [[1, 2], [3, 4]]\nb = [1.5]\n", numeric_arrays="numpy")
+        new = eztoml.loads("a = [[1, 2], [3, 5]]\nb = [1.5]\n", numeric_arrays="numpy")
+
+        self.assertEqual(eztoml.diff(old, new).changed, [("a",)])
+        self.assertEqual(eztoml.diff(old, eztoml.loads("a = [[1, 2], [3, 4]]\nb = [1.5]\n")), ([], [], []))
+
+
+class TestNumericArraysOption(unittest.TestCase):
+    def test_unsupported(self):
+        with self.assertRaises(ValueError):
+            eztoml.loads("a = [1]", numeric_arrays="pandas")
+
+    def test_hooks(self):
+        for hook in ({"parse_float": Decimal}, {"parse_int": str}, {"array_factory": tuple}):
+            with self.assertRaises(ValueError):
+                eztoml.loads("a = [1.5, 2.5]", numeric_arrays="numpy", **hook)
@@ -0,0 +1,96 @@
+from __future__ import unicode_literals
+import io
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import eztoml
+
+try:
+    import concurrent.futures
+except ImportError:
+    # only available from python 3.2
+    concurrent = None
+
+
+class TestLoadMany(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.paths = []
+
+        for i in range(20):
+            path = os.path.join(self.tmp_dir, "{}.toml".format(i))
+            self.paths.append(path)
+
+            with io.open(path, "wt", encoding="utf-8") as f:
+                f.write("index = {}\nwhen = 1979-05-27T07:32:00-08:00\n".format(i) if i != 7 else "index = \n")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def check(self, results):
+        results = dict(results)
+        self.assertEqual(len(results), 20)
+        self.assertIsInstance(results.pop(self.paths[7]), eztoml.EzTomlDecodeError)
+
+        for i, path in enumerate(self.paths):
+            if path in results:
+                self.assertEqual(results[path]["index"], i)
+                self.assertEqual(results[path]["when"].utcoffset().total_seconds(), -8 * 3600)
+
+    @unittest.skipUnless(concurrent, "requires concurrent.futures")
+    def test_process(self):
+        self.check(eztoml.load_many(self.paths, workers=2, chunksize=3))
+
+    @unittest.skipUnless(concurrent, "requires concurrent.futures")
+    def test_thread_ordered(self):
+        results = list(eztoml.load_many(self.paths, workers=2, executor="thread", ordered=True, chunksize=3))
+        self.assertListEqual([path for path, _ in results], self.paths)
+        self.check(results)
+
+    @unittest.skipUnless(concurrent, "requires concurrent.futures")
+    def test_missing(self):
+        (path, result), = eztoml.load_many([os.path.join(self.tmp_dir, "missing.toml")], executor="thread")
+        self.assertIsInstance(result, (IOError, OSError))
+
+    def test_pickle_tz(self):
+        tz = eztoml.EzTomlTz("+05:30")
+        self.assertEqual(pickle.loads(pickle.dumps(tz)).utcoffset(None), tz.utcoffset(None))
+
+
+@unittest.skipUnless(concurrent, "requires concurrent.futures")
+class TestDecodeParallel(unittest.TestCase):
+    src = "".join(
+        '[[records]]\nid = {0}\nnote = """\n[not.a.table]\n"""\n\n[section{0}]\nvalues = [\n  [{0}, 1],\n]\n'.format(i)
+        for i in range(200)
+    )
+
+    def test_decode(self):
+        self.assertDictEqual(eztoml.decode_parallel(self.src, workers=2), eztoml.loads(self.src))
+
+    def test_frozen(self):
+        self.assertEqual(eztoml.decode_parallel(self.src, workers=2, frozen=True), eztoml.loads(self.src, frozen=True))
+
+    def test_compact_records(self):
+        text = self.src + "[records.meta]\nx = 1\n[[records.inner]]\ny = 1\n"
+        self.assertEqual(
+            eztoml.decode_parallel(text, workers=2, compact_records=True), eztoml.loads(text, compact_records=True)
+        )
+
+    def test_duplicate_table(self):
+        with self.assertRaises(eztoml.EzTomlDecodeError):
+            eztoml.decode_parallel(self.src + "[section3]\nvalue = 1\n", workers=2)
+
+    def test_load_path(self):
+        tmp_dir = tempfile.mkdtemp()
+        path = os.path.join(tmp_dir, "records.toml")
+
+        try:
+            with io.open(path, "wt", encoding="utf-8") as f:
+                f.write(self.src)
+
+            self.assertDictEqual(eztoml.load_path(path, workers=2), eztoml.loads(self.src))
+        finally:
+            shutil.rmtree(tmp_dir)
@@ -0,0 +1,77 @@
+from __future__ import unicode_literals
+import io
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+
+import eztoml
+
+src = """# top comment
+title = "x"   # trailing
+dotted.key = 5
+
+[package]
+  name = "eztoml"
+  version = "0.1.0" # bump me
+
+[[servers]]
+host = 'a'
+
+["quoted.table"]
+value = [1, 2]
+"""
+
+
+class TestPatch(unittest.TestCase):
+    def test_patch_text(self):
+        patched = eztoml.patch_text(
+            src,
+            {
+                "package.version": "1.2.3",
+                "title": "y",
+                "dotted.key": 6,
+                '"quoted.table".value': [3],
+                ("package", "name"): "n",
+            },
+        )
+        expected = (
+            src.replace('"0.1.0"', '"1.2.3"')
+            .replace('"x"', '"y"')
+            .replace("= 5", "= 6")
+            .replace("[1, 2]", "[3]")
+            .replace('"eztoml"', '"n"')
+        )
+        self.assertEqual(patched, expected)
+
+    def test_missing(self):
+        for key in ("package.missing", "servers.host", "missing.key"):
+            with self.assertRaises(KeyError):
+                eztoml.patch_text(src, {key: 1})
+
+    def test_array_sub_tables(self):
+        text = '[[bin]]\nname = "a"\n[bin.meta]\nversion = "1"\n\n[[bin]]\nname = "b"\n[bin.meta]\nversion = "2"\n'
+
+        for key in ("bin.meta.version", "bin.name"):
+            with self.assertRaises(KeyError):
+                eztoml.patch_text(text, {key: "9"})
+
+    def test_patch_file(self):
+        tmp_dir = tempfile.mkdtemp()
+
+        try:
+            path = os.path.join(tmp_dir, "pyproject.toml")
+            with io.open(path, "wt", encoding="utf-8") as f:
+                f.write(src)
+
+            os.chmod(path, 0o644)
+            eztoml.patch_file(path, {"package.version": "1.2.3"})
+
+            with io.open(path, "rt", encoding="utf-8") as f:
+                self.assertEqual(f.read(), src.replace('"0.1.0"', '"1.2.3"'))
+
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o644)
+            self.assertEqual(os.listdir(tmp_dir), ["pyproject.toml"])
+        finally:
+            shutil.rmtree(tmp_dir)
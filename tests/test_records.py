@@ -0,0 +1,57 @@
+from __future__ import unicode_literals
+import copy
+import pickle
+import unittest
+
+import eztoml
+from eztoml.types import Record
+
+src = "".join('[[rows]]\nid = {0}\nname = "row{0}"\n'.format(i) for i in range(5))
+
+
+class TestCompactRecords(unittest.TestCase):
+    def test_records(self):
+        document = eztoml.loads(src, compact_records=True)
+        rows = document["rows"]
+
+        self.assertEqual(rows, eztoml.loads(src)["rows"])
+        self.assertTrue(all(isinstance(row, Record) for row in rows))
+        self.assertEqual(len(set(type(row) for row in rows)), 1)
+        self.assertEqual(list(rows[1]), ["id", "name"])
+        self.assertEqual(rows[1]["name"], "row1")
+        self.assertNotIn("missing", rows[1])
+        self.assertFalse(hasattr(rows[1], "__dict__"))
+
+    def test_read_only(self):
+        row = eztoml.loads(src, compact_records=True)["rows"][0]
+
+        with self.assertRaises(TypeError):
+            row["id"] = 1
+        with self.assertRaises(TypeError):
+            row._0 = 1
+
+    def test_copy(self):
+        row = eztoml.loads(src, compact_records=True)["rows"][0]
+
+        self.assertEqual(pickle.loads(pickle.dumps(row)), row)
+        self.assertIs(type(copy.deepcopy(row)), type(row))
+        self.assertEqual(eztoml.dumps({"row": row}), eztoml.dumps({"row": dict(row)}))
+
+    def test_mixed_shapes(self):
+        document = eztoml.loads("[[a]]\nx = 1\n[[a]]\ny = 2\n[[a]]\nx = 3\n", compact_records=True)
+        self.assertEqual([type(row) is dict for row in document["a"]], [False, True, False])
+
+    def test_sub_tables(self):
+        text = "[[a]]\nx = 1\n[[a.b]]\ny = 1\n[[a]]\nx = 2\n[a.s]\nz = 1\n"
+        document = eztoml.loads(text, compact_records=True, frozen=True)
+
+        self.assertEqual(document, eztoml.loads(text, frozen=True))
+        self.assertIsInstance(document["a"][0]["b"], tuple)
+        self.assertIsInstance(document["a"][0]["b"][0], Record)
+
+    def test_reopen_last_row(self):
+        text = "[[r]]\na = 1\n[[r]]\na = 2\n[r.sub]\nx = 1\n[[r.inner]]\ny = 1\n"
+        document = eztoml.loads(text, compact_records=True)
+
+        self.assertEqual(document, eztoml.loads(text))
+        self.assertIsInstance(document["r"][0], Record)
@@ -0,0 +1,94 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import date
+
+import eztoml
+
+if sys.version_info >= (3, 8):
+    from typing import List
+
+    from eztoml.schema import compile_schema
+    from .schema_fixtures import Config, Database
+else:
+    # dataclasses are new in python 3.7, and TypedDict in 3.8
+    Config = None
+
+src = """
+title = "TOML Example"
+released = 1979-05-27
+
+[owner]
+name = "Tom"
+dob = 1979-05-27T07:32:00-08:00
+
+[database]
+ports = [8001, 8001, 8002]
+limits = {cpu = 1, memory = 2.5}
+ratio = 1
+
+[[children]]
+title = "child"
+released = 1980-01-01
+"""
+
+
+@unittest.skipIf(Config is None, "dataclasses and TypedDict require python 3.8")
+class TestSchema(unittest.TestCase):
+    def test_loads(self):
+        config = eztoml.loads(src, schema=Config)
+
+        self.assertIsInstance(config, Config)
+        self.assertEqual(config.owner["name"], "Tom")
+        self.assertEqual(config.database, Database([8001, 8001, 8002], {"cpu": 1.0, "memory": 2.5}, 1.0))
+        self.assertIsInstance(config.database.ratio, float)
+        self.assertEqual(config.children, [Config("child", date(1980, 1, 1))])
+
+    def test_frozen(self):
+        config = eztoml.loads(src, schema=Config, frozen=True)
+        self.assertEqual(config.database.ports, [8001, 8001, 8002])
+
+    def test_cached(self):
+        self.assertIs(compile_schema(Config), compile_schema(Config))
+        self.assertIs(compile_schema(List[Database]), compile_schema(List[Database]))
+
+    def test_errors(self):
+        with self.assertRaises(eztoml.EzTomlDecodeError) as exc:
+            eztoml.loads(src.replace("8002", '"8002"'), schema=Config)
+        self.assertEqual(str(exc.exception), "Expected int for database.ports.2, not str")
+
+        with self.assertRaises(eztoml.EzTomlDecodeError) as exc:
+            eztoml.loads(src + "extra = 1\n", schema=Config)
+        self.assertEqual(str(exc.exception), "Unexpected key children.0.extra for Config")
+
+        with self.assertRaises(eztoml.EzTomlDecodeError) as exc:
+            eztoml.loads('released = 1979-05-27T00:00:00', schema=Config)
+        self.assertEqual(str(exc.exception), "Expected date for released, not datetime")
+
+        with self.assertRaises(eztoml.EzTomlDecodeError) as exc:
+            eztoml.loads('title = "missing"', schema=Config)
+        self.assertEqual(str(exc.exception), "Missing key released for Config")
+
+    def test_load_path(self):
+        tmp_dir = tempfile.mkdtemp()
+        path = os.path.join(tmp_dir, "config.toml")
+
+        try:
+            with open(path, "w") as f:
+                f.write(src)
+
+            for options in ({}, {"cache_dir": os.path.join(tmp_dir, "cache")}, {"workers": 2}):
+                self.assertEqual(eztoml.load_path(path, schema=Config, **options), eztoml.loads(src, schema=Config))
+                self.assertEqual(eztoml.load_path(path, schema=Config, **options), eztoml.loads(src, schema=Config))
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    @unittest.skipIf(sys.version_info < (3, 10), "unions with | are new in python 3.10")
+    def test_union_operator(self):
+        document = eztoml.loads("a = 1\nb = 1.5\n", schema=dict[str, int | float | None])
+        self.assertEqual(document, {"a": 1, "b": 1.5})
+
+        with self.assertRaises(eztoml.EzTomlDecodeError):
+            eztoml.loads('a = "1"', schema=dict[str, int | None])
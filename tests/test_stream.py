@@ -0,0 +1,22 @@
+from __future__ import unicode_literals
+import io
+import unittest
+
+import eztoml
+
+
+class TestLoadStream(unittest.TestCase):
+    def test_text_stream(self):
+        stream = io.StringIO('a = 1\n---\n[b]\nc = "d"\n---\n')
+        self.assertListEqual(list(eztoml.load_stream(stream)), [{"a": 1}, {"b": {"c": "d"}}])
+
+    def test_bytes_stream(self):
+        stream = io.BytesIO(b"a = 1\n%%\n\n%%\nb = 2\n")
+        self.assertListEqual(list(eztoml.load_stream(stream, separator="%%")), [{"a": 1}, {}, {"b": 2}])
+
+    def test_invalid_document(self):
+        documents = eztoml.load_stream(io.StringIO("a = 1\n---\na = \n"))
+        self.assertDictEqual(next(documents), {"a": 1})
+
+        with self.assertRaises(eztoml.EzTomlDecodeError):
+            next(documents)
@@ -0,0 +1,76 @@
+from __future__ import unicode_literals
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+import eztoml
+from eztoml.types import unicode_type, InlineString, RawInlineString, MultiLineString, RawMultiLineString
+
+src = """plain = "x"
+title = 'raw'
+
+[[servers]]
+host = \"\"\"
+multi\"\"\"
+tags = ["a", 'b', {k = '''lit'''}]
+
+[[servers]]
+host = 'h2'
+
+  [servers.meta]
+  name = 'deep'
+"""
+
+
+class TestStyleMap(unittest.TestCase):
+    def test_record(self):
+        styles = {}
+        document = eztoml.loads(src, styles=styles)
+
+        self.assertIs(type(document["title"]), unicode_type)
+        self.assertDictEqual(
+            styles,
+            {
+                ("title",): RawInlineString,
+                ("plain",): InlineString,
+                ("servers", 0, "host"): MultiLineString,
+                ("servers", 0, "tags", 0): InlineString,
+                ("servers", 0, "tags", 1): RawInlineString,
+                ("servers", 0, "tags", 2, "k"): RawMultiLineString,
+                ("servers", 1, "host"): RawInlineString,
+                ("servers", 1, "meta", "name"): RawInlineString,
+            },
+        )
+
+    def test_round_trip(self):
+        styles = {}
+        document = eztoml.loads(src, styles=styles, cache=True)
+
+        # keys are sorted, since dicts don't keep their insertion order on python 2
+        self.assertEqual(eztoml.dumps(document, sort_keys=True, preserve_style=True, styles=styles), src)
+
+        # the string classes of preserve_style subclass str, which can't hold decoded strings on python 2
+        if unicode_type is str:
+            self.assertEqual(
+                eztoml.dumps(document, sort_keys=True, preserve_style=True, styles=styles),
+                eztoml.dumps(eztoml.loads(src, preserve_style=True), sort_keys=True, preserve_style=True),
+            )
+
+        self.assertNotEqual(eztoml.dumps(document, sort_keys=True, styles=styles), src)
+
+    def test_lint(self):
+        tmp_dir = tempfile.mkdtemp()
+
+        try:
+            path = os.path.join(tmp_dir, "styles.toml")
+            with io.open(path, "wt", encoding="utf-8") as f:
+                f.write(src)
+
+            eztoml.lint_files([path, "--preserve-style", "--sort-keys"])
+
+            with io.open(path, "rt", encoding="utf-8") as f:
+                self.assertEqual(f.read(), src)
+        finally:
+            shutil.rmtree(tmp_dir)
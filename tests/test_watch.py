@@ -0,0 +1,95 @@
+from __future__ import unicode_literals
+import io
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import eztoml
+
+
+class TestWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "config.toml")
+        self.events = []
+        self.write("a = 1\nb = 2\n")
+        self.watcher = eztoml.Watcher([self.path], lambda *args: self.events.append(args))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, contents, mtime=None):
+        with io.open(self.path, "wt", encoding="utf-8") as f:
+            f.write(contents)
+
+        if mtime is not None:
+            os.utime(self.path, (mtime, mtime))
+
+    def test_poll(self):
+        self.assertListEqual(self.watcher.poll(), [self.path])
+        self.assertListEqual(self.watcher.poll(), [])
+
+        path, document, changes = self.events[-1]
+        self.assertDictEqual(document, {"a": 1, "b": 2})
+        self.assertListEqual(sorted(changes.added), [("a",), ("b",)])
+
+        self.write("a = 1\nc = 30\n")
+        self.watcher.poll()
+
+        path, document, changes = self.events[-1]
+        self.assertDictEqual(document, {"a": 1, "c": 30})
+        self.assertEqual(changes, ([("c",)], [("b",)], []))
+
+    def test_touched(self):
+        self.watcher.poll()
+        self.write("a = 1\nb = 2\n", mtime=1)
+
+        # the hash is unchanged, so the file isn't decoded again
+        self.assertListEqual(self.watcher.poll(), [])
+        self.assertEqual(len(self.events), 1)
+
+    def test_removed(self):
+        self.watcher.poll()
+        os.remove(self.path)
+        self.watcher.poll()
+
+        path, document, changes = self.events[-1]
+        self.assertIsNone(document)
+        self.assertListEqual(sorted(changes.removed), [("a",), ("b",)])
+
+    def test_errors(self):
+        errors = []
+        watcher = eztoml.Watcher([self.path], self.events.append, on_error=lambda *args: errors.append(args))
+        self.write("a = \n")
+        watcher.poll()
+
+        self.assertListEqual(self.events, [])
+        self.assertIsInstance(errors[0][1], eztoml.EzTomlDecodeError)
+
+    def test_callback_errors(self):
+        errors = []
+
+        def callback(path, document, changes):
+            self.events.append(document)
+            if len(self.events) == 1:
+                raise ValueError("callback failed")
+
+        watcher = eztoml.Watcher([self.path], callback, on_error=lambda *args: errors.append(args))
+        watcher.poll()
+        self.write("a = 2\n")
+        watcher.poll()
+
+        self.assertEqual(len(self.events), 2)
+        self.assertEqual(self.events[-1], {"a": 2})
+        self.assertIsInstance(errors[0][1], ValueError)
+
+    def test_watch(self):
+        loaded = threading.Event()
+        watcher = eztoml.watch([self.path], lambda *args: loaded.set(), interval=0.01)
+
+        try:
+            self.assertTrue(loaded.wait(5))
+        finally:
+            watcher.stop()